@@ -0,0 +1,52 @@
+import os
+import threading
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.webm')
+
+# dir path -> (mtime_ns, ((name, path), ...)); a directory's mtime changes whenever
+# an entry is added, removed or renamed, so an unchanged mtime means an unchanged listing
+_CACHE: dict[str, tuple[int, tuple[tuple[str, str], ...]]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def list_videos(dir_path: str) -> dict[str, str]:
+    """
+    Lists the video files directly inside a directory, rescanning only when it changed.
+
+    Args:
+        dir_path: Directory to list.
+
+    Returns:
+        Mapping of file name to path, in scandir order; empty if the directory doesn't exist.
+    """
+    try:
+        mtime = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        return {}
+
+    with _CACHE_LOCK:
+        cached = _CACHE.get(dir_path)
+    if cached is None or cached[0] != mtime:
+        with os.scandir(dir_path) as entries:
+            videos = tuple(
+                (e.name, e.path) for e in entries
+                if e.is_file(follow_symlinks=False) and e.name.lower().endswith(VIDEO_EXTENSIONS)
+            )
+        cached = (mtime, videos)
+        with _CACHE_LOCK:
+            _CACHE[dir_path] = cached
+    return dict(cached[1])
+
+
+def invalidate(dir_path: str | None = None) -> None:
+    """
+    Drops the cached listing so the next list_videos call rescans.
+
+    Args:
+        dir_path: Directory to forget, or None to forget all of them.
+    """
+    with _CACHE_LOCK:
+        if dir_path is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(dir_path, None)
@@ -1,6 +1,363 @@
+import bisect
+import collections
+import functools
+import json
+import math
 import subprocess
 import os
 import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+
+# A pipeline op is a dict with a "kind" key plus kind-specific fields:
+#   {"kind": "trim", "start": float | str, "end": float | str}
+#   {"kind": "remove", "chunks": list[tuple[float, float]]}
+#   {"kind": "vertical"}
+#   {"kind": "speed", "speed": float}
+# Times of each op are relative to the output of the previous op.
+Op = dict[str, Any]
+
+# Silence scanning decodes to 16 kHz mono and measures RMS over 32 ms windows
+_SCAN_SAMPLE_RATE = 16000
+_SCAN_WINDOW = 512
+
+# Matched against raw stderr bytes to skip decoding ffmpeg's ASCII output
+_SILENCE_RE = re.compile(rb"silence_(start|end):\s*(-?\d+\.?\d*)")
+
+# Scales video to fit width and pads to 1080x1920
+# Puts the video 1/3rd from the top of the vertical video
+VERTICAL_FILTER = "crop=iw*0.9:ih,scale=1080:-1,pad=1080:1920:(ow-iw)/2:(oh-ih)/3:color=black"
+
+# Hardware backends in order of preference: (hwaccel, encoder, encoder options)
+_HWACCELS = [
+    ("cuda", "h264_nvenc", ["-preset", "p4", "-rc", "vbr", "-cq", "23"]),
+    ("qsv", "h264_qsv", ["-preset", "medium", "-global_quality", "23"]),
+    ("videotoolbox", "h264_videotoolbox", ["-q:v", "65"]),
+]
+
+# Shared pool for ffmpeg jobs so batch workloads run in parallel. Size defaults
+# to the number of cores and can be overridden with SHORTER_FFMPEG_WORKERS.
+_POOL: ThreadPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool_size() -> int:
+    try:
+        workers = int(os.environ.get("SHORTER_FFMPEG_WORKERS", "0"))
+    except ValueError:
+        workers = 0
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def ffmpeg_pool() -> ThreadPoolExecutor:
+    """Returns the shared ffmpeg worker pool, creating it on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix="ffmpeg")
+        return _POOL
+
+
+def _run_ffmpeg(
+    command: list[str],
+    error_message: str,
+    progress_callback: Callable[[float], None] | None = None,
+) -> bool:
+    if progress_callback is not None:
+        # machine-readable progress on stdout, just before the output path
+        command = [*command[:-1], "-progress", "pipe:1", "-nostats", command[-1]]
+    # Drain stderr through a large buffer, keeping only the tail for error reports.
+    # stderr echoes file names and metadata in whatever encoding they have, so bad bytes
+    # are replaced rather than raising and leaving the pipe unread
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE if progress_callback is not None else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20,
+        text=True,
+        errors="replace",
+    )
+    assert process.stderr is not None
+    tail: collections.deque[str] = collections.deque(maxlen=20)
+    if progress_callback is None:
+        tail.extend(process.stderr)
+    else:
+        assert process.stdout is not None
+        # stderr drains on a helper thread so neither pipe can fill up and stall ffmpeg
+        drain = threading.Thread(target=tail.extend, args=(process.stderr,), daemon=True)
+        drain.start()
+        for line in process.stdout:
+            if line.startswith("out_time_us="):
+                try:
+                    progress_callback(int(line[12:]) / 1e6)
+                except ValueError:  # N/A before the first frame
+                    pass
+        drain.join()
+    if process.wait() != 0:
+        print(f"{error_message}: {''.join(tail)}")
+        return False
+    return True
+
+
+def submit_ffmpeg(
+    command: list[str],
+    error_message: str = "Error running ffmpeg",
+    progress_callback: Callable[[float], None] | None = None,
+) -> Future[bool]:
+    """
+    Queues an ffmpeg command on the shared worker pool.
+
+    Args:
+        command: The full ffmpeg command line, ending with the output path.
+        error_message: Prefix for the message printed if the command fails.
+        progress_callback: Called from the worker thread with the seconds of output written so far.
+
+    Returns:
+        A future resolving to True if successful, False otherwise.
+    """
+    return ffmpeg_pool().submit(_run_ffmpeg, command, error_message, progress_callback)
+
+
+@functools.lru_cache(maxsize=None)
+def detect_hwaccel() -> tuple[str, str, list[str]] | None:
+    """
+    Finds a working hardware decoder/encoder pair, probing ffmpeg only once.
+
+    Set SHORTER_HWACCEL=none to force software encoding.
+
+    Returns:
+        The (hwaccel, encoder, encoder options) entry to use, or None for CPU.
+    """
+    if os.environ.get("SHORTER_HWACCEL", "").lower() == "none":
+        return None
+    try:
+        hwaccels = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            check=True, capture_output=True, text=True, errors="replace",
+        ).stdout.split()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+    for hwaccel, encoder, encoder_args in _HWACCELS:
+        if hwaccel not in hwaccels:
+            continue
+        # The encoder can be compiled in without a usable device, so try a tiny encode
+        test_command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+            "-c:v", encoder, "-f", "null", "-",
+        ]
+        if subprocess.run(test_command, capture_output=True).returncode == 0:
+            return hwaccel, encoder, encoder_args
+    return None
+
+
+def _thread_flags() -> list[str]:
+    """Thread counts for decoding and filtering; SHORTER_FFMPEG_THREADS overrides the default."""
+    # the pool already runs one job per worker, so the cores are split between them
+    threads = os.environ.get("SHORTER_FFMPEG_THREADS") or str(max(1, (os.cpu_count() or 1) // _pool_size()))
+    return ["-threads", threads, "-filter_threads", threads, "-filter_complex_threads", threads]
+
+
+def build_ffmpeg_base(input_path: str, input_args: list[str] | None = None) -> list[str]:
+    """Returns the start of a re-encoding ffmpeg command, with hardware decode if available."""
+    hw = detect_hwaccel()
+    hwaccel_args = ["-hwaccel", hw[0]] if hw else []
+    return ["ffmpeg", "-y", *_thread_flags(), *hwaccel_args, *(input_args or []), "-i", input_path]
+
+
+def video_encoder_args() -> list[str]:
+    """Returns the hardware encoder options, or an empty list when encoding on the CPU."""
+    hw = detect_hwaccel()
+    return ["-c:v", hw[1], *hw[2]] if hw else []
+
+
+def atempo_chain(speed: float) -> str:
+    """Returns an audio filter chain that speeds audio up by the given factor."""
+    # FFmpeg atempo filter maxes out at 2.0, so we chain them for higher speeds
+    count = max(0, math.ceil(math.log2(speed / 2.0)))
+    return "atempo=2.0," * count + f"atempo={speed / 2 ** count}"
+
+
+def _keep_ranges(chunks_to_remove: list[tuple[float, float]]) -> list[tuple[float, float | None]]:
+    """Returns the (start, end) ranges left between the chunks; the last range has no end."""
+    keep_ranges: list[tuple[float, float | None]] = []
+    last_end = 0.0
+    for start, end in sorted(chunks_to_remove):
+        if start > last_end:
+            keep_ranges.append((last_end, start))
+        last_end = max(last_end, end)
+    keep_ranges.append((last_end, None))
+    return keep_ranges
+
+
+def _remove_chains(
+    chunks_to_remove: list[tuple[float, float]],
+    n: int,
+    v_in: str,
+    a_in: str,
+    v_out: str,
+    a_out: str,
+    audio: bool = True,
+    video: bool = True,
+) -> list[str]:
+    """
+    Returns chains that drop the chunks by trimming each kept range and concatenating them.
+
+    Unlike a select expression OR-ing every range, each frame only passes through
+    the trim nodes, so the per-frame cost doesn't grow with the number of cuts.
+    Without audio only the video legs are built, and without video only the audio legs.
+    """
+    bounds = [
+        f"start={start}" if end is None else f"start={start}:end={end}"
+        for start, end in _keep_ranges(chunks_to_remove)
+    ]
+    count = len(bounds)
+    indices = range(count)
+    chains = []
+    if video:
+        chains.append(f"{v_in}split={count}" + "".join([f"[v{n}s{i}]" for i in indices]))
+        chains += [f"[v{n}s{i}]trim={b},setpts=PTS-STARTPTS[v{n}t{i}]" for i, b in enumerate(bounds)]
+        if not audio:
+            chains.append("".join([f"[v{n}t{i}]" for i in indices]) + f"concat=n={count}:v=1:a=0{v_out}")
+            return chains
+    chains.append(f"{a_in}asplit={count}" + "".join([f"[a{n}s{i}]" for i in indices]))
+    chains += [f"[a{n}s{i}]atrim={b},asetpts=PTS-STARTPTS[a{n}t{i}]" for i, b in enumerate(bounds)]
+    if not video:
+        chains.append("".join([f"[a{n}t{i}]" for i in indices]) + f"concat=n={count}:v=0:a=1{a_out}")
+        return chains
+    chains.append("".join([f"[v{n}t{i}][a{n}t{i}]" for i in indices]) + f"concat=n={count}:v=1:a=1{v_out}{a_out}")
+    return chains
+
+
+def _op_filters(op: Op) -> tuple[str, str]:
+    """Returns the (video, audio) filter chain for a single pipeline op."""
+    kind = op["kind"]
+    if kind == "trim":
+        return (
+            f"trim=start='{op['start']}':end='{op['end']}',setpts=PTS-STARTPTS",
+            f"atrim=start='{op['start']}':end='{op['end']}',asetpts=PTS-STARTPTS",
+        )
+    if kind == "vertical":
+        return VERTICAL_FILTER, "anull"
+    if kind == "speed":
+        return f"setpts=PTS/{op['speed']}", atempo_chain(op["speed"])
+    raise ValueError(f"Unknown pipeline op: {kind}")
+
+
+# Ops that change audio timing, so the audio has to be filtered rather than copied
+_AUDIO_OPS = frozenset({"trim", "remove", "speed"})
+
+
+def build_pipeline(ops: list[Op], audio: bool = True, video: bool = True) -> list[str]:
+    """
+    Composes pipeline ops into filter_complex chains.
+
+    Each op reads the previous op's [vN]/[aN] pair, the first op reads [0:v]/[0:a]
+    and the last one writes [outv]/[outa], so the whole pipeline decodes and
+    encodes the video exactly once.
+
+    Args:
+        ops: The ops to apply, in order.
+        audio: Whether to build the audio legs; without them only [outv] is written.
+        video: Whether to build the video legs; without them only [outa] is written.
+
+    Returns:
+        The filter chains, to be joined with ";".
+    """
+    if not ops:
+        return (["[0:v]null[outv]"] if video else []) + (["[0:a]anull[outa]"] if audio else [])
+
+    chains = []
+    v_in, a_in = "[0:v]", "[0:a]"
+    for n, op in enumerate(ops):
+        last = n == len(ops) - 1
+        v_out = "[outv]" if last else f"[v{n}]"
+        a_out = "[outa]" if last else f"[a{n}]"
+        if op["kind"] == "remove":
+            chains.extend(_remove_chains(op["chunks"], n, v_in, a_in, v_out, a_out, audio, video))
+        else:
+            video_filter, audio_filter = _op_filters(op)
+            if video:
+                chains.append(f"{v_in}{video_filter}{v_out}")
+            if audio:
+                chains.append(f"{a_in}{audio_filter}{a_out}")
+        v_in, a_in = v_out, a_out
+    return chains
+
+
+def run_pipeline(
+    input_path: str,
+    output_path: str,
+    ops: list[Op],
+    progress_callback: Callable[[float], None] | None = None,
+) -> bool:
+    """
+    Runs the given ops over a video with a single ffmpeg invocation.
+
+    Args:
+        input_path: Path to the input video.
+        output_path: Path to save the processed video.
+        ops: The ops to apply, in order. See `Op`.
+        progress_callback: Called with the seconds of output written so far.
+
+    Returns:
+        True if successful, False otherwise.
+    """
+    if not os.path.exists(os.path.dirname(output_path)):
+        os.makedirs(os.path.dirname(output_path))
+
+    # A leading trim becomes an input seek, so ffmpeg skips to the nearest
+    # keyframe instead of decoding and discarding everything before the start
+    input_args = []
+    if ops and ops[0]["kind"] == "trim":
+        input_args = ["-ss", str(ops[0]["start"]), "-to", str(ops[0]["end"])]
+        ops = ops[1:]
+
+    # Audio only goes through the graph when an op changes its timing or there is
+    # no video to carry the graph; otherwise it is copied as is, and clips without
+    # an audio track get none
+    filter_video = has_video_stream(input_path)
+    if filter_video:
+        video_args = ["-map", "[outv]", *video_encoder_args()]
+    else:
+        video_args = ["-vn"]
+    if not has_audio_stream(input_path):
+        audio_args = ["-an"]
+        filter_audio = False
+    elif not filter_video or any(op["kind"] in _AUDIO_OPS for op in ops):
+        audio_args = ["-map", "[outa]"]
+        filter_audio = True
+    else:
+        audio_args = ["-map", "0:a", "-c:a", "copy"]
+        filter_audio = False
+
+    # write filter graph to a temporary file to avoid Windows command-line length limits
+    script_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False)
+    script_file.write(";".join(build_pipeline(ops, filter_audio, filter_video)))
+    script_file.close()
+
+    command = [
+        *build_ffmpeg_base(input_path, input_args),
+        "-/filter_complex", script_file.name,
+        *video_args,
+        *audio_args,
+        output_path,
+    ]
+
+    try:
+        return submit_ffmpeg(command, "Error running pipeline", progress_callback).result()
+    finally:
+        try:
+            os.remove(script_file.name)
+        except OSError:
+            pass
+
 
 def cut_video(
     input_path: str,
@@ -26,37 +383,295 @@ def cut_video(
         os.makedirs(os.path.dirname(output_path))
 
     if is_vertical:
-        # Command for vertical short
-        # Scales video to fit width and pads to 1080x1920
-        # Puts the video 1/3rd from the top of the vertical video
-        command = [
-            "ffmpeg",
-            "-y",
-            "-i", input_path,
-            "-ss", start_time,
-            "-to", end_time,
-            "-vf", "crop=iw*0.9:ih,scale=1080:-1,pad=1080:1920:(ow-iw)/2:(oh-ih)/3:color=black",
-            "-c:a", "copy",
-            output_path,
-        ]
+        return run_pipeline(input_path, output_path, [
+            {"kind": "trim", "start": start_time, "end": end_time},
+            {"kind": "vertical"},
+        ])
+
+    command = [
+        "ffmpeg",
+        "-y",
+        "-i", input_path,
+        "-ss", start_time,
+        "-to", end_time,
+        "-c", "copy",
+        output_path,
+    ]
+
+    return submit_ffmpeg(command, "Error cutting video").result()
+
+@functools.lru_cache(maxsize=128)
+def _probe(input_path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    command = [
+        "ffprobe", "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", input_path
+    ]
+    result = subprocess.run(command, check=True, capture_output=True, text=True, errors="replace")
+    return json.loads(result.stdout)
+
+def get_video_info(input_path: str) -> dict[str, Any] | None:
+    """
+    Probes a video's format and streams with a single ffprobe call.
+
+    Results are cached by path, modification time and size, so the returned dict
+    is shared and should not be modified.
+
+    Returns:
+        The parsed ffprobe JSON output, or None if probing failed.
+    """
+    try:
+        stat = os.stat(input_path)
+        return _probe(input_path, stat.st_mtime_ns, stat.st_size)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        print(f"Error probing video: {e}")
+        return None
+
+def _threshold_amplitude(silence_threshold: str) -> float:
+    """Converts an ffmpeg noise level ('-30dB' or a ratio like '0.03') to an int16 amplitude."""
+    if silence_threshold.lower().endswith("db"):
+        ratio = 10 ** (float(silence_threshold[:-2]) / 20)
     else:
-        # Command for normal cut
-        command = [
-            "ffmpeg",
-            "-y",
-            "-i", input_path,
-            "-ss", start_time,
-            "-to", end_time,
-            "-c", "copy",
-            output_path,
+        ratio = float(silence_threshold)
+    return ratio * 32768
+
+def _rms_silence_ranges(
+    input_path: str,
+    silence_threshold: str,
+    silence_duration: float,
+) -> tuple[list[float], list[float]] | None:
+    """Finds silences by scanning the RMS of short windows over decoded mono PCM."""
+    command = [
+        "ffmpeg", "-v", "error", "-i", input_path, "-vn",
+        "-f", "s16le", "-ac", "1", "-ar", str(_SCAN_SAMPLE_RATE), "-",
+    ]
+    threshold = _threshold_amplitude(silence_threshold)
+    window_bytes = _SCAN_WINDOW * 2
+    read_size = window_bytes * 2048
+
+    quiet_blocks = []
+    leftover = b""
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, bufsize=1 << 20)
+    assert process.stdout is not None
+    while True:
+        block = process.stdout.read(read_size)
+        if not block:
+            break
+        block = leftover + block
+        usable = len(block) - len(block) % window_bytes
+        leftover = block[usable:]
+        windows = np.frombuffer(block[:usable], dtype=np.int16).reshape(-1, _SCAN_WINDOW).astype(np.float32)
+        rms = np.sqrt(np.einsum("ij,ij->i", windows, windows) / _SCAN_WINDOW)
+        quiet_blocks.append(rms < threshold)
+    if process.wait() != 0:
+        print(f"Error detecting silence: ffmpeg exited with code {process.returncode}")
+        return None
+    if not quiet_blocks:
+        return [], []
+
+    # Edges of runs of quiet windows, padded so runs touching either end still close
+    quiet = np.concatenate([[False], np.concatenate(quiet_blocks), [False]])
+    edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+    window_seconds = _SCAN_WINDOW / _SCAN_SAMPLE_RATE
+    silence_starts, silence_ends = [], []
+    for start, end in zip(edges[::2] * window_seconds, edges[1::2] * window_seconds):
+        if end - start >= silence_duration:
+            silence_starts.append(float(start))
+            silence_ends.append(float(end))
+    return silence_starts, silence_ends
+
+def _silencedetect_ranges(
+    input_path: str,
+    silence_threshold: str,
+    silence_duration: float,
+) -> tuple[list[float], list[float]] | None:
+    """Finds silences with ffmpeg's silencedetect filter."""
+    # -nostats keeps the carriage-return progress line out of stderr
+    detect_command = [
+        "ffmpeg", "-hide_banner", "-nostats", "-i", input_path, "-af",
+        f"silencedetect=n={silence_threshold}:d={silence_duration}",
+        "-f", "null", "-",
+    ]
+
+    silence_starts: list[float] = []
+    silence_ends: list[float] = []
+    # Parse stderr line by line so memory stays bounded on long inputs
+    process = subprocess.Popen(
+        detect_command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20,
+    )
+    assert process.stderr is not None
+    for line in process.stderr:
+        match = _SILENCE_RE.search(line)
+        if match:
+            kind, value = match.groups()
+            (silence_starts if kind == b"start" else silence_ends).append(float(value))
+    if process.wait() != 0:
+        print(f"Error detecting silence: ffmpeg exited with code {process.returncode}")
+        return None
+    return silence_starts, silence_ends
+
+def detect_silence(
+    input_path: str,
+    silence_threshold: str = "-30dB",
+    silence_duration: float = 1.0,
+    padding: float = 0.5,
+    method: str = "silencedetect",
+) -> list[tuple[float, float]] | None:
+    """
+    Detects silent sections of a video.
+
+    Args:
+        input_path: Path to the input video.
+        silence_threshold: The noise level to be considered silence.
+        silence_duration: The duration of silence to be detected (in seconds).
+        padding: The duration of silence to leave at the start and end of a cut.
+        method: "silencedetect" to use ffmpeg's per-sample silencedetect filter, or
+            "rms" to scan decoded PCM with NumPy. With "rms" the threshold applies to
+            the RMS level of 32 ms windows rather than to each sample, so the same
+            arguments give different cut points.
+
+    Returns:
+        A list of (start, end) chunks to remove, or None if detection failed.
+    """
+    if method == "rms":
+        ranges = _rms_silence_ranges(input_path, silence_threshold, silence_duration)
+    elif method == "silencedetect":
+        ranges = _silencedetect_ranges(input_path, silence_threshold, silence_duration)
+    else:
+        raise ValueError(f"Unknown silence detection method: {method}")
+    if ranges is None:
+        return None
+    silence_starts, silence_ends = ranges
+
+    chunks_to_remove = []
+    for start, end in zip(silence_starts, silence_ends):
+        # Only cut if the silence is long enough for the padding
+        if end - start > 2 * padding:
+            chunks_to_remove.append((start + padding, end - padding))
+    return chunks_to_remove
+
+def _copy_file(src: str, dst: str) -> None:
+    """Copies a file in-process, letting the kernel do the copy where it can."""
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        remaining = os.fstat(src_file.fileno()).st_size
+        try:
+            # Zero-copy (or reflink) copy on Linux
+            while remaining > 0:
+                copied = os.copy_file_range(src_file.fileno(), dst_file.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            if remaining == 0:
+                return
+        except (AttributeError, OSError):
+            pass
+    # shutil uses sendfile/fcopyfile/CopyFile2 depending on the platform
+    shutil.copyfile(src, dst)
+
+def _concat_segments(
+    segment_dir: str,
+    segment_names: list[str],
+    output_path: str,
+    audio_source: str | None = None,
+) -> bool:
+    """
+    Joins MPEG-TS segments from segment_dir into output_path without re-encoding.
+
+    If audio_source is given, the segments are video-only and that file's audio is
+    encoded once over the joined video, with no gap at the segment boundaries.
+    """
+    # MPEG-TS segments concatenate cleanly without re-muxing timestamps
+    list_path = os.path.join(segment_dir, "list.txt")
+    with open(list_path, "w") as list_file:
+        for name in segment_names:
+            list_file.write(f"file '{name}'\n")
+
+    if audio_source is None:
+        stream_args = ["-c", "copy"]
+    else:
+        stream_args = [
+            "-i", audio_source,
+            "-map", "0:v", "-map", "1:a?",
+            "-c:v", "copy", "-c:a", "aac",
         ]
+    command = [
+        "ffmpeg", "-y", "-f", "concat", "-safe", "0",
+        "-i", list_path,
+        *stream_args,
+        output_path,
+    ]
+    return submit_ffmpeg(command, "Error concatenating segments").result()
 
-    try:
-        subprocess.run(command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error cutting video: {e.stderr}")
-        return False
+def get_keyframe_times(input_path: str) -> list[float]:
+    """Returns the sorted presentation times (seconds) of the video keyframes."""
+    command = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0", input_path
+    ]
+    # One line per packet, so stream it rather than capturing the whole output
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, bufsize=1 << 20, text=True, errors="replace"
+    )
+    assert process.stdout is not None
+    keyframes = []
+    for line in process.stdout:
+        pts_time, _, flags = line.partition(",")
+        if flags.startswith("K") and pts_time not in ("", "N/A"):
+            keyframes.append(float(pts_time))
+    if process.wait() != 0:
+        print(f"Error getting keyframes: ffprobe exited with code {process.returncode}")
+        return []
+    return sorted(keyframes)
+
+def _stream_copy_remove(
+    input_path: str,
+    output_path: str,
+    chunks_to_remove: list[tuple[float, float]],
+) -> bool | None:
+    """
+    Removes chunks by stream-copying the kept segments and concatenating them.
+
+    Each kept segment is moved back to start on the previous keyframe, and a
+    chunk that ends up fully covered by that shift is kept rather than removed.
+
+    Returns:
+        True if successful, False if ffmpeg failed, or None if the input has no
+        usable keyframes and the caller should re-encode instead.
+    """
+    keyframes = get_keyframe_times(input_path)
+    if not keyframes:
+        return None
+
+    segments: list[tuple[float, float | None]] = []
+    for start, end in _keep_ranges(chunks_to_remove):
+        index = bisect.bisect_right(keyframes, start) - 1
+        snapped = keyframes[index] if index >= 0 else 0.0
+        prev_end = segments[-1][1] if segments else None
+        if prev_end is not None and snapped <= prev_end:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((snapped, end))
+
+    if not os.path.exists(os.path.dirname(output_path)):
+        os.makedirs(os.path.dirname(output_path))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        futures = []
+        segment_names = []
+        for n, (start, end) in enumerate(segments):
+            command = ["ffmpeg", "-y", "-ss", str(start), "-i", input_path]
+            if end is not None:
+                command.extend(["-t", str(end - start)])
+            segment_names.append(f"seg_{n}.ts")
+            command.extend(["-c", "copy", "-avoid_negative_ts", "make_zero", os.path.join(tmp_dir, segment_names[-1])])
+            futures.append(submit_ffmpeg(command, "Error copying segment"))
+        if not all([future.result() for future in futures]):
+            return False
+
+        return _concat_segments(tmp_dir, segment_names, output_path)
 
 def remove_silence(
     input_path: str,
@@ -64,6 +679,7 @@ def remove_silence(
     silence_threshold: str = "-30dB",
     silence_duration: float = 1.0,
     padding: float = 0.5,
+    fast: bool = False,
 ) -> bool:
     """
     Removes silent sections from a video using ffmpeg, leaving padding.
@@ -74,6 +690,8 @@ def remove_silence(
         silence_threshold: The noise level to be considered silence.
         silence_duration: The duration of silence to be detected (in seconds).
         padding: The duration of silence to leave at the start and end of a cut.
+        fast: If true, stream-copies the kept segments instead of re-encoding.
+            Cuts snap to keyframes, so slightly more than the padding may be kept.
 
     Returns:
         True if successful, False otherwise.
@@ -81,79 +699,41 @@ def remove_silence(
     if not os.path.exists(os.path.dirname(output_path)):
         os.makedirs(os.path.dirname(output_path))
 
-    # Step 1: Detect silence
-    detect_command = [
-        "ffmpeg", "-i", input_path, "-af",
-        f"silencedetect=n={silence_threshold}:d={silence_duration}",
-        "-f", "null", "-",
-    ]
+    # Without a video stream to keep in sync, silenceremove can detect and cut in one pass
+    if not has_video_stream(input_path):
+        command = [
+            "ffmpeg", "-y", "-i", input_path,
+            "-af",
+            f"silenceremove=stop_periods=-1:stop_threshold={silence_threshold}"
+            f":stop_duration={silence_duration}:stop_silence={2 * padding}",
+            output_path,
+        ]
+        if submit_ffmpeg(command, "Error removing silence").result():
+            return True
+        print("Single-pass silence removal failed, falling back to detection.")
 
-    try:
-        output = subprocess.run(
-            detect_command,
-            check=True,
-            capture_output=True,
-            text=True,
-        ).stderr
-    except subprocess.CalledProcessError as e:
-        print(f"Error detecting silence: {e.stderr}")
+    chunks_to_remove = detect_silence(input_path, silence_threshold, silence_duration, padding)
+    if chunks_to_remove is None:
         return False
 
-    # Step 2: Parse silence timestamps
-    silence_starts = re.findall(r"silence_start: (\d+\.?\d*)", output)
-    silence_ends = re.findall(r"silence_end: (\d+\.?\d*)", output)
-
-    if not silence_starts:
-        print("No silence detected, copying file.")
-        if input_path != output_path:
-             subprocess.run(["cp", input_path, output_path], check=True)
-        return True
-
-    # Step 3: Create list of chunks to remove, including padding
-    chunks_to_remove = []
-    for start, end in zip(silence_starts, silence_ends):
-        start, end = float(start), float(end)
-        # Only cut if the silence is long enough for the padding
-        if end - start > 2 * padding:
-            chunks_to_remove.append((start + padding, end - padding))
-
     if not chunks_to_remove:
         print("No silences long enough to cut after padding, copying file.")
         if input_path != output_path:
-            subprocess.run(["cp", input_path, output_path], check=True)
+            _copy_file(input_path, output_path)
         return True
 
-    # Step 4: Generate ffmpeg filter to remove chunks
-    clips = []
-    last_end = 0.0
-    for start, end in sorted(chunks_to_remove):
-        clips.append(f"between(t,{last_end},{start})")
-        last_end = end
-
-    # Add the last segment of the video
-    clips.append(f"gte(t,{last_end})")
-
-    select_filter = "+".join(clips)
-
-    # Step 5: Run ffmpeg command to apply filter
-    process_command = [
-        "ffmpeg", "-y", "-i", input_path,
-        "-vf", f"select='{select_filter}',setpts=N/FRAME_RATE/TB",
-        "-af", f"aselect='{select_filter}',asetpts=N/SR/TB",
-        output_path,
-    ]
+    if fast:
+        success = _stream_copy_remove(input_path, output_path, chunks_to_remove)
+        if success is not None:
+            return success
 
-    try:
-        subprocess.run(process_command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error removing silence: {e.stderr}")
-        return False
+    return run_pipeline(input_path, output_path, [{"kind": "remove", "chunks": chunks_to_remove}])
 
 def remove_chunks(
     input_path: str,
     output_path: str,
     chunks_to_remove: list[tuple[float, float]],
+    fast: bool = False,
 ) -> bool:
     """
     Removes specified chunks from a video using ffmpeg.
@@ -162,6 +742,8 @@ def remove_chunks(
         input_path: Path to the input video.
         output_path: Path to save the processed video.
         chunks_to_remove: A list of (start, end) tuples for chunks to remove.
+        fast: If true, stream-copies the kept segments instead of re-encoding.
+            Cuts snap to keyframes, so slightly more than requested may be kept.
 
     Returns:
         True if successful, False otherwise.
@@ -172,65 +754,49 @@ def remove_chunks(
     if not chunks_to_remove:
         print("No chunks to remove, copying file.")
         if input_path != output_path:
-            subprocess.run(["cp", input_path, output_path], check=True)
+            _copy_file(input_path, output_path)
         return True
 
-    # Build the ffmpeg filter
-    clips = []
-    last_end = 0.0
-    for start, end in sorted(chunks_to_remove):
-        clips.append(f"between(t,{last_end},{start})")
-        last_end = end
-
-    clips.append(f"gte(t,{last_end})")
-
-    select_filter = "+".join(clips)
-
-    # Run ffmpeg command
-    command = [
-        "ffmpeg", "-y", "-i", input_path,
-        "-vf", f"select='{select_filter}',setpts=N/FRAME_RATE/TB",
-        "-af", f"aselect='{select_filter}',asetpts=N/SR/TB",
-        output_path,
-    ]
+    if fast:
+        success = _stream_copy_remove(input_path, output_path, chunks_to_remove)
+        if success is not None:
+            return success
 
-    try:
-        subprocess.run(command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error removing chunks: {e.stderr}")
-        return False
+    return run_pipeline(input_path, output_path, [{"kind": "remove", "chunks": chunks_to_remove}])
 
 def get_video_duration(input_path: str) -> float:
-    command = [
-        "ffprobe", "-v", "error", "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1", input_path
-    ]
+    info = get_video_info(input_path)
     try:
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        return float(result.stdout)
-    except (subprocess.CalledProcessError, ValueError) as e:
+        return float(info["format"]["duration"]) if info else 0.0
+    except (KeyError, ValueError) as e:
         print(f"Error getting video duration: {e}")
         return 0.0
 
 def get_video_resolution(input_path: str) -> tuple[int, int] | None:
-    command = [
-        "ffprobe", "-v", "error", "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-of", "csv=s=x:p=0", input_path
-    ]
-    try:
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        width, height = map(int, result.stdout.strip().split('x'))
-        return width, height
-    except Exception as e:
-        print(f"Error getting video resolution: {e}")
-        return None
+    info = get_video_info(input_path)
+    for stream in info.get("streams", []) if info else []:
+        if stream.get("codec_type") == "video":
+            return int(stream["width"]), int(stream["height"])
+    print(f"Error getting video resolution: no video stream in {input_path}")
+    return None
+
+def has_video_stream(input_path: str) -> bool:
+    info = get_video_info(input_path)
+    if info is None:
+        return True
+    return any(stream.get("codec_type") == "video" for stream in info.get("streams", []))
+
+def has_audio_stream(input_path: str) -> bool:
+    info = get_video_info(input_path)
+    if info is None:
+        return True
+    return any(stream.get("codec_type") == "audio" for stream in info.get("streams", []))
 
 def speed_up_video(
     input_path: str,
     output_path: str,
     speed: float,
+    progress_callback: Callable[[int], None] | None = None,
 ) -> bool:
     """
     Speeds up a video and its audio.
@@ -239,115 +805,89 @@ def speed_up_video(
         input_path: Path to the input video.
         output_path: Path to save the processed video.
         speed: The speed multiplier (e.g., 2.0 for double speed).
+        progress_callback: Called with the percentage done, if the duration is known.
 
     Returns:
         True if successful, False otherwise.
     """
-    if not os.path.exists(os.path.dirname(output_path)):
-        os.makedirs(os.path.dirname(output_path))
-
-    # FFmpeg atempo filter maxes out at 2.0, so we chain them for higher speeds
-    atempo_filter = ""
-    temp_speed = speed
-    while temp_speed > 2.0:
-        atempo_filter += "atempo=2.0,"
-        temp_speed /= 2.0
-    atempo_filter += f"atempo={temp_speed}"
-
-
-    command = [
-        "ffmpeg", "-y", "-i", input_path,
-        "-filter_complex",
-        f"[0:v]setpts=PTS/{speed}[v];[0:a]{atempo_filter}[a]",
-        "-map", "[v]",
-        "-map", "[a]",
-        output_path
-    ]
+    on_progress = None
+    output_duration = get_video_duration(input_path) / speed
+    if progress_callback is not None and output_duration > 0:
+        def on_progress(seconds: float) -> None:
+            progress_callback(min(100, int(100 * seconds / output_duration)))
 
-    try:
-        subprocess.run(command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error speeding up video: {e.stderr}")
-        return False
+    return run_pipeline(input_path, output_path, [{"kind": "speed", "speed": speed}], on_progress)
 
 def process_zoom_pan(
     input_path: str,
     output_path: str,
     zoom_regions: list[dict],
 ) -> bool:
+    """
+    Creates a vertical video that crops to each zoom region from its start time.
+
+    Every segment's video is encoded by its own ffmpeg job on the worker pool, then
+    the segments are joined without re-encoding and the original audio is encoded
+    once over them.
+
+    Args:
+        input_path: Path to the input video.
+        output_path: Path to save the processed video.
+        zoom_regions: Dicts with a 'time' (seconds) and a 'rect' (QRect) to crop to.
+
+    Returns:
+        True if successful, False otherwise.
+    """
     if not zoom_regions:
         print("No zoom regions specified, copying file.")
         if input_path != output_path:
-            subprocess.run(["cp", input_path, output_path], check=True)
+            _copy_file(input_path, output_path)
         return True
 
-    video_duration = get_video_duration(input_path)
-    if video_duration == 0.0:
-        return False
-
     # Sort regions by time
     regions = sorted(zoom_regions, key=lambda x: x['time'])
 
-    filter_complex = []
-    clip_streams = []
-    num_clips = 0
+    # (start, end, rect) per segment; end is None for the segment running to the end
+    segments: list[tuple[float, float | None, Any]] = []
 
     # Initial un-zoomed segment
-    if not regions or regions[0]['time'] > 0:
-        end_of_initial = regions[0]['time'] if regions else video_duration
-        trim_filter = (
-            f"[0:v]trim=start=0:end={end_of_initial},"
-            "scale=1080:1920:force_original_aspect_ratio=decrease,"
-            "pad=1080:1920:(ow-iw)/2:(oh-ih)/3,"
-            f"setsar=1,setpts=PTS-STARTPTS[v{num_clips}];"
-        )
-        atrim_filter = f"[0:a]atrim=start=0:end={end_of_initial},asetpts=PTS-STARTPTS[a{num_clips}];"
-        filter_complex.extend([trim_filter, atrim_filter])
-        clip_streams.append(f"[v{num_clips}]")
-        clip_streams.append(f"[a{num_clips}]")
-        num_clips += 1
+    if regions[0]['time'] > 0:
+        segments.append((0.0, regions[0]['time'], None))
 
-    # Process each zoom region
     for i, region in enumerate(regions):
         start_time = region['time']
-        end_time = regions[i+1]['time'] if i + 1 < len(regions) else video_duration
-        rect = region['rect']
-
-        if end_time <= start_time:
+        end_time = regions[i+1]['time'] if i + 1 < len(regions) else None
+        if end_time is not None and end_time <= start_time:
             continue
+        segments.append((start_time, end_time, region['rect']))
 
-        crop_filter = (
-            f"[0:v]trim=start={start_time}:end={end_time},"
-            f"crop={rect.width()}:{rect.height()}:{rect.x()}:{rect.y()},"
-            "scale=1080:1920:force_original_aspect_ratio=decrease,"
-            "pad=1080:1920:(ow-iw)/2:(oh-ih)/3,"
-            f"setsar=1,setpts=PTS-STARTPTS[v{num_clips}];"
-        )
-        audio_trim_filter = (
-             f"[0:a]atrim=start={start_time}:end={end_time},"
-             f"asetpts=PTS-STARTPTS[a{num_clips}];"
-        )
-        filter_complex.extend([crop_filter, audio_trim_filter])
-        clip_streams.append(f"[v{num_clips}]")
-        clip_streams.append(f"[a{num_clips}]")
-        num_clips += 1
-
-    # Concatenate all clips
-    concat_streams = "".join(clip_streams)
-    concat_filter = f"{concat_streams}concat=n={num_clips}:v=1:a=1[outv][outa]"
-    filter_complex.append(concat_filter)
-
-    command = [
-        "ffmpeg", "-y", "-i", input_path,
-        "-filter_complex", "".join(filter_complex),
-        "-map", "[outv]", "-map", "[outa]",
-        output_path
-    ]
+    if not os.path.exists(os.path.dirname(output_path)):
+        os.makedirs(os.path.dirname(output_path))
 
-    try:
-        subprocess.run(command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error processing zoom/pan: {e.stderr}")
-        return False
\ No newline at end of file
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        futures = []
+        segment_names = []
+        for n, (start_time, end_time, rect) in enumerate(segments):
+            crop_filter = f"crop={rect.width()}:{rect.height()}:{rect.x()}:{rect.y()}," if rect else ""
+            video_filter = (
+                crop_filter
+                + "scale=1080:1920:force_original_aspect_ratio=decrease,"
+                "pad=1080:1920:(ow-iw)/2:(oh-ih)/3,"
+                "setsar=1"
+            )
+            duration_args = ["-t", str(end_time - start_time)] if end_time is not None else []
+            segment_names.append(f"seg_{n}.ts")
+            command = [
+                *build_ffmpeg_base(input_path, ["-ss", str(start_time)]),
+                *duration_args,
+                "-vf", video_filter,
+                *(video_encoder_args() or ["-c:v", "libx264", "-preset", "veryfast"]),
+                # encoding audio per segment would restart AAC priming at every cut
+                "-an",
+                os.path.join(tmp_dir, segment_names[-1]),
+            ]
+            futures.append(submit_ffmpeg(command, "Error processing zoom/pan"))
+        if not all([future.result() for future in futures]):
+            return False
+
+        return _concat_segments(tmp_dir, segment_names, output_path, audio_source=input_path)
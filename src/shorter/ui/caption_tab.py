@@ -1,11 +1,14 @@
+import hashlib
 import os
 import subprocess
 import tempfile
 import json
+import threading
+from functools import lru_cache
 from typing import List, Dict, Tuple, Any
 
-import nemo.collections.asr as nemo_asr
-from PySide6.QtCore import QThread, Signal, Qt
+import numpy as np
+from PySide6.QtCore import QCoreApplication, QThread, QTimer, Signal, Qt
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -13,6 +16,7 @@ from PySide6.QtWidgets import (
     QLabel,
     QPushButton,
     QComboBox,
+    QDoubleSpinBox,
     QTableWidget,
     QTableWidgetItem,
     QProgressBar,
@@ -21,15 +25,49 @@ from PySide6.QtWidgets import (
 )
 from PIL import ImageFont
 
+from shorter.core.video_utils import atempo_chain, build_ffmpeg_base, ffmpeg_pool, get_video_info, video_encoder_args
+
+# Set SHORTER_DEBUG=1 to print the ffmpeg commands being run
+DEBUG = bool(os.environ.get("SHORTER_DEBUG"))
+
 # Directory that holds cuts to be captioned
 CLIPS_DIR = os.path.join("videos", "cuts")
 # Directory that holds bundled fonts
 FONTS_DIR = "fonts"
 # Output directory for captioned videos
 OUTPUT_DIR = os.path.join(CLIPS_DIR, "captioned")
+# Audio is transcribed in chunks of this many seconds, batched together
+TRANSCRIBE_CHUNK_SECONDS = 30
+# Neighbouring chunks share this many seconds, so a word cut at one chunk's edge is whole in the next
+TRANSCRIBE_OVERLAP_SECONDS = 4
+# Sample rate the ASR model expects
+ASR_SAMPLE_RATE = 16000
+# This model is relatively small (~120 MB) compared to others and decent quality
+ASR_MODEL_NAME = "nvidia/parakeet-tdt-0.6b-v2"
+
+# ASR model shared by the whole application, loaded once by _load_model
+_NEMO_MODEL: Any = None
+_MODEL_LOCK = threading.Lock()
+
+# Finished transcripts, keyed by clip path, modification time and model
+TRANSCRIPT_CACHE_DIR = os.path.join(CLIPS_DIR, ".cache")
+
+# Consecutive same-size words closer than this (seconds) are shown together
+WORD_GROUP_GAP = 0.05
+
+# File extensions picked up from CLIPS_DIR / FONTS_DIR
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mkv", ".avi", ".webm"})
+FONT_EXTENSIONS = frozenset({".ttf", ".otf"})
+
+# Caption font sizes, proportional to the video height
+FONT_SIZE_RATIOS = {
+    "small": 0.035,   # smaller for less emphasis
+    "medium": 0.055,
+    "large": 0.100,   # even larger for stronger emphasis
+}
 
 # Words that should not start a new, enlarged caption line
-AVOID_LIST = {
+AVOID_LIST = frozenset({
     # articles / determiners
     "a", "an", "the", "this", "that", "these", "those",
 
@@ -56,7 +94,7 @@ AVOID_LIST = {
     "don't", "doesn't", "didn't",
     "can't", "couldn't", "won't", "wouldn't", "shouldn't",
     "haven't", "hasn't", "hadn't",
-}
+})
 
 # -------------------------------------------------
 # Helper functions
@@ -69,30 +107,37 @@ def _ensure_directories() -> None:
             os.makedirs(d, exist_ok=True)
 
 
-def _get_video_info(path: str) -> Dict[str, float]:
-    """Return width, height and duration (seconds) for the given video."""
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height,duration",
-        "-of", "json",
-        path,
-    ]
-    res = subprocess.run(cmd, check=True, text=True, capture_output=True)
-    info = json.loads(res.stdout)["streams"][0]
+def _get_video_info(path: str) -> Dict[str, Any]:
+    """Return width, height, duration (seconds) and audio presence for the given video."""
+    # shares the ffprobe cache with the other tabs, keyed by path, mtime and size
+    probe = get_video_info(path)
+    if probe is None:
+        raise RuntimeError(f"Could not probe {path}")
+    streams = probe["streams"]
+    info = next(s for s in streams if s.get("codec_type") == "video")
     return {
         "width": int(info["width"]),
         "height": int(info["height"]),
-        "duration": float(info.get("duration", 0)),
+        # Matroska/WebM only carry the duration at container level
+        "duration": float(info.get("duration") or probe.get("format", {}).get("duration") or 0),
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams),
     }
 
 
+def _list_files(directory: str, extensions: frozenset) -> List[str]:
+    """Return paths of regular files in directory whose extension is in extensions."""
+    with os.scandir(directory) as it:
+        return [
+            e.path for e in it
+            if e.is_file(follow_symlinks=False) and os.path.splitext(e.name)[1].lower() in extensions
+        ]
+
+
 def _font_candidates() -> List[str]:
     """Return paths to *.ttf / *.otf fonts from FONTS_DIR. Fall back to system fonts if none found."""
     fonts = []
     if os.path.isdir(FONTS_DIR):
-        fonts = [os.path.join(FONTS_DIR, f) for f in os.listdir(FONTS_DIR) if f.lower().endswith((".ttf", ".otf"))]
+        fonts = _list_files(FONTS_DIR, FONT_EXTENSIONS)
     if not fonts:
         # fallback: try to find any system fonts via matplotlib (which is already a dependency elsewhere)
         from matplotlib.font_manager import findSystemFonts
@@ -100,86 +145,297 @@ def _font_candidates() -> List[str]:
     return fonts
 
 
+@lru_cache(maxsize=None)
 def _choose_font(size_key: str, video_height: int) -> int:
     """Return pixel size for the given key ('small', 'medium', 'large')."""
-    # Sizes are proportional to the video height
-    sizes = {
-        "small": 0.035,   # smaller for less emphasis
-        "medium": 0.055,
-        "large": 0.100,   # even larger for stronger emphasis
-    }
-    return int(video_height * sizes[size_key])
+    return int(video_height * FONT_SIZE_RATIOS[size_key])
+
+
+@lru_cache(maxsize=64)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Open a font once per (path, size) instead of re-parsing the file for every word."""
+    return ImageFont.truetype(path, size)
+
+
+def _ass_time(seconds: float) -> str:
+    """Format seconds as an ASS timestamp (H:MM:SS.cc)."""
+    cs = max(0, int(round(seconds * 100)))
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f"{h}:{m:02}:{s:02}.{cs:02}"
+
+
+_ASS_ESCAPE = str.maketrans({"\\": "\u29f5", "{": "(", "}": ")"})
+
+
+def _ass_text(word: str) -> str:
+    """Keep a word from being read as ASS override tags or line breaks."""
+    return word.translate(_ASS_ESCAPE)
+
+
+def _ass_header(width: int, height: int, font_family: str, bold: bool) -> str:
+    """ASS header whose PlayRes matches the video, so font sizes and positions are in pixels."""
+    return (
+        "[Script Info]\n"
+        "ScriptType: v4.00+\n"
+        f"PlayResX: {width}\n"
+        f"PlayResY: {height}\n"
+        "WrapStyle: 2\n"
+        "ScaledBorderAndShadow: yes\n"
+        "\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding\n"
+        f"Style: Default,{font_family},{_choose_font('medium', height)},&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+        f"{-1 if bold else 0},0,0,0,100,100,0,0,1,0,0,8,0,0,0,1\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+
+
+def _load_model() -> Any:
+    """Return the shared ASR model, loading it on first use; blocks while another thread loads it."""
+    global _NEMO_MODEL
+    with _MODEL_LOCK:
+        if _NEMO_MODEL is None:
+            # NeMo and torch take seconds to import, so they load here rather than at app startup
+            import nemo.collections.asr as nemo_asr
+            import torch
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model = nemo_asr.models.EncDecCTCModel.from_pretrained(model_name=ASR_MODEL_NAME)
+            _NEMO_MODEL = model.to(device).eval()
+        return _NEMO_MODEL
+
+
+def _transcript_cache_path(path: str) -> str:
+    """Return the cache file for this clip's transcript; changes whenever the clip does."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{ASR_MODEL_NAME}"
+    return os.path.join(TRANSCRIPT_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def _cached_words(path: str) -> List[Dict] | None:
+    """Return the cached transcript for a clip, or None if it has not been transcribed."""
+    try:
+        with open(_transcript_cache_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _has_cached_words(path: str) -> bool:
+    """Return whether the clip has a transcript cache file, without reading it."""
+    try:
+        return os.path.exists(_transcript_cache_path(path))
+    except OSError:
+        return False
+
+
+def _store_words(path: str, words: List[Dict]) -> None:
+    """Save a transcript so the clip is not transcribed again."""
+    try:
+        os.makedirs(TRANSCRIPT_CACHE_DIR, exist_ok=True)
+        with open(_transcript_cache_path(path), "w", encoding="utf-8") as f:
+            json.dump(words, f, default=float)
+    except (OSError, TypeError) as e:
+        print(f"Error caching transcript: {e}")
+
+
+def _chunk_windows(n_samples: int) -> List[Tuple[int, float]]:
+    """Return (start sample, keep-until seconds) for each overlapping chunk of a clip's audio.
+
+    Words whose midpoint lies past keep-until belong to the next chunk, which hears them whole.
+    """
+    if n_samples <= 0:
+        return []
+    chunk_len = TRANSCRIBE_CHUNK_SECONDS * ASR_SAMPLE_RATE
+    step = chunk_len - TRANSCRIBE_OVERLAP_SECONDS * ASR_SAMPLE_RATE
+    # the last chunk is the first one reaching the end of the audio
+    count = 1 + max(0, -(-(n_samples - chunk_len) // step))
+    starts = [k * step for k in range(count)]
+    # hand over in the middle of each overlap, as far as possible from both chunks' edges
+    cuts = [(nxt + start + chunk_len) / (2 * ASR_SAMPLE_RATE) for start, nxt in zip(starts, starts[1:])]
+    return list(zip(starts, cuts + [float("inf")]))
+
+
+def _merge_windows(windows: List[Tuple[List[Dict], float]]) -> List[Dict]:
+    """Join one clip's (words, keep-until) chunks, in order, into a transcript with every word once."""
+    merged: List[Dict] = []
+    for words, keep_until in windows:
+        for w in words:
+            mid = (w["start_time"] + w["end_time"]) / 2
+            if mid >= keep_until:
+                break
+            # the overlap repeats words the previous chunk already kept
+            if merged and mid <= merged[-1]["end_time"]:
+                continue
+            merged.append(w)
+    return merged
+
+
+def _filter_path(path: str) -> str:
+    """Quote a path for use as a filter option value (forward slashes, escaped colons)."""
+    return "'" + path.replace("\\", "/").replace(":", "\\:").replace("'", "\\'") + "'"
 
 
 # -------------------------------------------------
 # Worker threads
 # -------------------------------------------------
 
+class _ModelLoaderThread(QThread):
+    """Loads the ASR model in the background so the first transcription starts warm."""
+
+    def run(self):
+        try:
+            _load_model()
+        except Exception as e:
+            # TranscriptionThread retries the load and reports the error to the user
+            print(f"Error preloading ASR model: {e}")
+
+
+def _decode_audio(path: str) -> np.ndarray:
+    """Decode a clip to mono 16 kHz float PCM straight into memory, no temporary wav."""
+    ff_cmd = [
+        "ffmpeg", "-v", "error", "-i", path, "-vn",
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ar", str(ASR_SAMPLE_RATE), "-ac", "1", "pipe:1",
+    ]
+    pcm = subprocess.run(ff_cmd, check=True, capture_output=True).stdout
+    return np.frombuffer(pcm, dtype=np.float32)
+
+
+def warm_asr_model() -> None:
+    """Start loading the ASR model in the background, once per application."""
+    app = QCoreApplication.instance()
+    if app is None or app.findChild(_ModelLoaderThread) is not None:
+        return
+    # owned by the application, which waits for the load on quit instead of destroying a running thread
+    loader = _ModelLoaderThread(app)
+    app.aboutToQuit.connect(loader.wait)
+    loader.start()
+
+
 class TranscriptionThread(QThread):
-    finished = Signal(list)
+    finished = Signal(dict)  # video path -> word list
     error = Signal(str)
 
-    def __init__(self, video_path: str):
+    def __init__(self, video_paths: List[str]):
         super().__init__()
-        self.video_path = video_path
-        # Lazy-load ASR model so we do it only once for the whole application
-        global _NEMO_MODEL
-        if "_NEMO_MODEL" not in globals():
-            _NEMO_MODEL = None  # type: ignore
-        self._model: Any = _NEMO_MODEL
+        self.video_paths = video_paths
+        self._model: Any = None
 
     def run(self):
         try:
-            if self._model is None:
-                # This model is relatively small (~120 MB) compared to others and decent quality
-                self._model = nemo_asr.models.EncDecCTCModel.from_pretrained(model_name="nvidia/parakeet-tdt-0.6b-v2")
-                globals()["_NEMO_MODEL"] = self._model  # cache for next time
-
-            # Extract mono 16 kHz wav to a temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                wav_path = tmp.name
-            ff_cmd = [
-                "ffmpeg", "-y", "-i", self.video_path, "-vn",
-                "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", wav_path,
+            # a cached transcript that fails to parse is a miss for that clip alone
+            results: Dict[str, List[Dict]] = {}
+            paths = []
+            for path in self.video_paths:
+                cached = _cached_words(path)
+                if cached is None:
+                    paths.append(path)
+                else:
+                    results[path] = cached
+            if not paths:
+                self.finished.emit(results)
+                return
+
+            import torch
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            # usually already loaded by the warm-up thread started with the tab
+            self._model = _load_model()
+
+            # decode every clip at once; ffmpeg does the work outside the GIL
+            audios = list(ffmpeg_pool().map(_decode_audio, paths))
+
+            # Transcribe overlapping chunks of every clip as one batch rather than each file on its own
+            chunk_len = TRANSCRIBE_CHUNK_SECONDS * ASR_SAMPLE_RATE
+            chunks = [
+                (audio[i:i + chunk_len], i / ASR_SAMPLE_RATE, path, keep_until)
+                for path, audio in zip(paths, audios)
+                for i, keep_until in _chunk_windows(len(audio))
             ]
-            subprocess.run(ff_cmd, check=True)
-
-            asr_out = self._model.transcribe([wav_path], timestamps=True)  # type: ignore[attr-defined]
-            word_ts = asr_out[0].timestamp["word"]  # list of Dict(word,start_time/offset,...)
+            results.update({path: [] for path in paths})
+            if not chunks:
+                self.finished.emit(results)
+                return
+            with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=device == "cuda"):
+                asr_out = self._model.transcribe(  # type: ignore[attr-defined]
+                    [chunk for chunk, _, _, _ in chunks],
+                    timestamps=True,
+                    batch_size=max(1, min(len(chunks), 32)),
+                )
 
             # Normalize timestamps to seconds – newer NeMo returns offsets (frames)
             win_stride = float(getattr(self._model.cfg.preprocessor, "window_stride", 0.02))  # seconds
             sec_per_frame = 8 * win_stride  # 8x subsampling for conformer-like models
 
-            for w in word_ts:
-                if "start_time" not in w and "start_offset" in w:
-                    w["start_time"] = float(w["start_offset"]) * sec_per_frame
-                if "end_time" not in w and "end_offset" in w:
-                    w["end_time"]   = float(w["end_offset"])   * sec_per_frame
-
-            self.finished.emit(word_ts)
+            per_chunk = [hyp.timestamp["word"] for hyp in asr_out]  # list of Dict(word,start_time/offset,...)
+            word_ts = [w for words in per_chunk for w in words]
+            n = len(word_ts)
+            if n:
+                # One NeMo version reports either times or offsets for every word
+                in_frames = "start_time" not in word_ts[0] and "start_offset" in word_ts[0]
+                start_key, end_key = ("start_offset", "end_offset") if in_frames else ("start_time", "end_time")
+                starts = np.fromiter((w.get(start_key, 0) for w in word_ts), dtype=np.float64, count=n)
+                ends = np.fromiter((w.get(end_key, 0) for w in word_ts), dtype=np.float64, count=n)
+                if in_frames:
+                    starts *= sec_per_frame
+                    ends *= sec_per_frame
+                # shift from chunk-relative to clip-relative time
+                chunk_starts = np.repeat([start for _, start, _, _ in chunks], [len(words) for words in per_chunk])
+                starts += chunk_starts
+                ends += chunk_starts
+                for w, start, end in zip(word_ts, starts.tolist(), ends.tolist()):
+                    w["start_time"] = start
+                    w["end_time"] = end
+
+            # chunks are in clip order, so each clip's windows are merged in time order
+            windows: Dict[str, List[Tuple[List[Dict], float]]] = {path: [] for path in paths}
+            for words, (_, _, path, keep_until) in zip(per_chunk, chunks):
+                windows[path].append((words, keep_until))
+            for path in paths:
+                results[path] = _merge_windows(windows[path])
+                _store_words(path, results[path])
+            self.finished.emit(results)
         except Exception as e:
             self.error.emit(str(e))
-        finally:
-            try:
-                if os.path.exists(wav_path):
-                    os.remove(wav_path)
-            except Exception:
-                pass
 
 
 class CaptioningThread(QThread):
-    finished = Signal(bool, str)  # success, message
-
-    def __init__(self, video_path: str, words: List[Dict], font_path: str, output_path: str):
+    done = Signal(bool, str)  # success, message; QThread.finished follows once run() has returned
+    progress = Signal(int)  # percent of the clip encoded
+
+    def __init__(
+        self,
+        video_path: str,
+        words: List[Dict],
+        font_path: str,
+        output_path: str,
+        width: int,
+        height: int,
+        has_audio: bool,
+        duration: float = 0.0,
+        pre_speed: float | None = None,
+    ):
         super().__init__()
         self.video_path = video_path
         self.words = words
         self.font_path = font_path
         self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.has_audio = has_audio
+        self.duration = duration
+        # speed-up applied in the same pass as the captions, saving a separate encode
+        self.pre_speed = pre_speed
 
     # ---------------- Private helpers ----------------
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _word_fontsize(word: str, video_height: int) -> Tuple[int, str]:
         """Return fontsize and size-key for a word based on rules."""
         # Decide size category: if the word is common, go smaller, else bigger.
@@ -191,126 +447,164 @@ class CaptioningThread(QThread):
             key = "medium"
         return _choose_font(key, video_height), key
 
+    def _word_groups(
+        self, video_height: int, fonts: Dict[str, Any], max_width_px: float
+    ) -> List[Tuple[str, float, float, str]]:
+        """Merge runs of back-to-back words with the same size into one (text, start, end, size_key) caption."""
+        groups: List[Tuple[str, float, float, str]] = []
+        for w in self.words:
+            word = w["word"]
+            start = float(w.get("start_time", w.get("start_offset", 0)))
+            end = float(w.get("end_time", w.get("end_offset", 0)))
+            _, size_key = self._word_fontsize(word, video_height)
+            if groups:
+                text, g_start, g_end, g_key = groups[-1]
+                merged = f"{text} {word}"
+                # only merge while the phrase still fits on one line at its size
+                if (
+                    g_key == size_key
+                    and start - g_end < WORD_GROUP_GAP
+                    and size_key in fonts
+                    and fonts[size_key].getlength(merged) <= max_width_px
+                ):
+                    groups[-1] = (merged, g_start, end, size_key)
+                    continue
+            groups.append((word, start, end, size_key))
+        return groups
+
     # --------------------------------------------------
     def run(self):
+        temp_paths: List[str] = []
         try:
-            _ensure_directories()
-            info = _get_video_info(self.video_path)
-            width, height = int(info["width"]), int(info["height"])
+            width, height = self.width, self.height
 
-            # FFmpeg filter graphs expect either forward slashes or double-backslashes in paths
-            font_ffmpeg_path = self.font_path.replace("\\", "/")
+            # libass picks fonts by family name, looking in the font's own directory
+            try:
+                family, style = ImageFont.truetype(self.font_path, 10).getname()
+            except Exception:
+                family, style = os.path.splitext(os.path.basename(self.font_path))[0], ""
+            bold = "bold" in (style or "").lower()
 
-            draw_filters = []
+            events = []
             y_base = int(height * 0.66)  # bottom third start
-            for idx, w in enumerate(self.words):
-                word = w["word"].replace("'", "\u2019")  # avoid ffmpeg quote issues
-                start = float(w.get("start_time", w.get("start_offset", 0)))
-                end = float(w.get("end_time", w.get("end_offset", 0))) + 0.12  # hold word a bit longer
-                fontsize, size_key = self._word_fontsize(word, height)
-
-                # Shrink font if the word would exceed video width
-                try:
-                    max_width_px = width * 0.95  # small margin
-                    while True:
-                        font_obj = ImageFont.truetype(self.font_path, fontsize)
-                        bbox = font_obj.getbbox(word)
-                        text_width = bbox[2] - bbox[0]
-                        if text_width <= max_width_px or fontsize <= 10:
-                            break
-                        fontsize -= 1
-                except Exception:
-                    # If PIL can't load the font, continue with chosen size
-                    pass
-
-                # y position – single line at bottom third (could be extended to multi-line)
-                y_pos = y_base
-
-                fade = 0.15
-                alpha_expr = (
-                    f"if(lt(t,{start}),0,"  # before start => invisible
-                    f"if(lt(t,{start+fade}),(t-{start})/{fade},"  # fade-in
-                    f"if(lt(t,{end-fade}),1,"  # fully visible
-                    f"if(lt(t,{end}),({end}-t)/{fade},0))))"  # fade-out then invisible
-                )
-
-                draw = (
-                    f"drawtext=fontfile='{font_ffmpeg_path}':"
-                    f"text='{word}':"
-                    f"fontcolor=white:alpha='{alpha_expr}':"
-                    f"fontsize={fontsize}:"
-                    f"x=(w-text_w)/2:y={y_pos}:"
-                    f"enable='between(t,{start},{end})'"
+            max_width_px = width * 0.95  # small margin
+            # single line centred at the bottom third, fading in and out over 150 ms; same for every event
+            placement = f"\\an8\\pos({width // 2},{y_base})\\fad(150,150)"
+            # Only three sizes are used per video, so open them up front
+            try:
+                fonts = {k: _load_font(self.font_path, _choose_font(k, height)) for k in ("small", "medium", "large")}
+            except Exception:
+                fonts = {}
+            fitted_sizes: Dict[Tuple[str, str], int] = {}
+            for word, start, end, size_key in self._word_groups(height, fonts, max_width_px):
+                end += 0.12  # hold words a bit longer
+                fontsize = _choose_font(size_key, height)
+
+                # Repeated words ("the", "and", ...) reuse the size measured the first time
+                fitted = fitted_sizes.get((size_key, word))
+                if fitted is not None:
+                    fontsize = fitted
+                else:
+                    # Shrink font if the word would exceed video width
+                    try:
+                        if fonts[size_key].getlength(word) > max_width_px:
+                            # binary search for the largest size that fits, never below 10
+                            lo, hi = 10, fontsize
+                            while lo < hi:
+                                mid = (lo + hi + 1) // 2
+                                if _load_font(self.font_path, mid).getlength(word) <= max_width_px:
+                                    lo = mid
+                                else:
+                                    hi = mid - 1
+                            fontsize = lo
+                    except Exception:
+                        # If PIL can't load the font, continue with chosen size
+                        pass
+                    fitted_sizes[(size_key, word)] = fontsize
+
+                events.append(
+                    f"Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Default,,0,0,0,,"
+                    f"{{{placement}\\fs{fontsize}}}{_ass_text(word)}"
                 )
-                draw_filters.append(draw)
 
-            vf = ",".join(draw_filters)
+            ass_file = tempfile.NamedTemporaryFile(mode="w", suffix=".ass", delete=False, encoding="utf-8")
+            ass_file.write(_ass_header(width, height, family, bold))
+            ass_file.write("\n".join(events) + "\n")
+            ass_file.close()
+            temp_paths.append(ass_file.name)
+
+            # One subtitles filter renders every word instead of a drawtext node per word
+            vf = (
+                f"subtitles=filename={_filter_path(ass_file.name)}:"
+                f"fontsdir={_filter_path(os.path.dirname(os.path.abspath(self.font_path)))}"
+            )
             # write filter graph to a temporary file to avoid Windows command-line length limits
+            map_args: List[str] = []
+            if self.pre_speed:
+                # captions are burned at transcript time, then the result is sped up
+                vf = f"[0:v]{vf},setpts=PTS/{self.pre_speed}[outv]"
+                map_args = ["-map", "[outv]"]
+                if self.has_audio:
+                    vf += f";[0:a]{atempo_chain(self.pre_speed)}[outa]"
+                    map_args += ["-map", "[outa]"]
             script_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False)
             script_file.write(vf)
             script_file.close()
-            # Check if the source video has at least one audio stream
-            has_audio = False
-            try:
-                audio_probe = subprocess.run(
-                    [
-                        "ffprobe",
-                        "-v",
-                        "error",
-                        "-select_streams",
-                        "a",
-                        "-show_entries",
-                        "stream=index",
-                        "-of",
-                        "json",
-                        self.video_path,
-                    ],
-                    text=True,
-                    capture_output=True,
-                    check=True,
-                )
-                audio_streams = json.loads(audio_probe.stdout).get("streams", [])
-                has_audio = len(audio_streams) > 0
-            except Exception:
-                # If ffprobe fails, assume no audio to be safe
-                has_audio = False
-
+            temp_paths.append(script_file.name)
             cmd = [
-                "ffmpeg",
-                "-y",
-                "-i",
-                self.video_path,
+                # decode on the GPU when available; frames come back to system memory for libass
+                *build_ffmpeg_base(self.video_path),
                 # provide the external filter graph file to ffmpeg using the new file option syntax (ffmpeg ≥ 7)
                 "-/filter_complex",
                 script_file.name,
+                *map_args,
             ]
 
-            if has_audio:
+            if self.has_audio and self.pre_speed:
+                # sped-up audio has to be re-encoded
+                cmd.extend(["-c:a", "aac"])
+            elif self.has_audio:
                 # copy audio stream if present
                 cmd.extend(["-c:a", "copy"])
             else:
                 # explicitly disable audio
                 cmd.append("-an")
 
-            # set a widely-supported video codec
-            cmd.extend(["-c:v", "libx264", "-preset", "medium", "-crf", "23"])
+            # hardware encoder if one works, otherwise a widely-supported software codec
+            cmd.extend(video_encoder_args() or ["-c:v", "libx264", "-preset", "medium", "-crf", "23"])
 
-            cmd.append(self.output_path)
+            # machine-readable progress on stdout instead of the stats line
+            cmd.extend(["-progress", "pipe:1", "-nostats"])
 
-            # Print the command for debugging purposes
-            print("FFmpeg command:", " ".join(cmd))
+            cmd.append(self.output_path)
 
-            subprocess.run(cmd, check=True)
-            # cleanup temporary filter script file
-            try:
-                os.remove(script_file.name)
-            except Exception:
-                pass
-            self.finished.emit(True, "Captioning complete.")
+            if DEBUG:
+                print("FFmpeg command:", " ".join(cmd))
+
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+            assert proc.stdout is not None
+            out_duration = self.duration / (self.pre_speed or 1.0)
+            for line in proc.stdout:
+                if out_duration > 0 and line.startswith(b"out_time_us="):
+                    try:
+                        out_us = int(line[12:])
+                    except ValueError:  # N/A before the first frame
+                        continue
+                    self.progress.emit(min(100, int(out_us / (out_duration * 1e4))))
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
+            self.done.emit(True, "Captioning complete.")
         except subprocess.CalledProcessError as e:
-            self.finished.emit(False, e.stderr or "ffmpeg error")
+            self.done.emit(False, e.stderr or "ffmpeg error")
         except Exception as exc:
-            self.finished.emit(False, str(exc))
+            self.done.emit(False, str(exc))
+        finally:
+            # cleanup temporary filter script and subtitle files, also when ffmpeg failed
+            for tmp_path in temp_paths:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
 
 
 # -------------------------------------------------
@@ -323,7 +617,10 @@ class CaptionTab(QWidget):
         _ensure_directories()
 
         self.video_map: Dict[str, str] = {}
+        self._videos_mtime: int | None = None
         self.words: List[Dict] = []
+        # Caption renders run side by side; each one is independent of the next
+        self.caption_workers: List[CaptioningThread] = []
 
         main_layout = QVBoxLayout(self)
 
@@ -341,6 +638,17 @@ class CaptionTab(QWidget):
         font_layout.addWidget(self.font_combo)
         main_layout.addLayout(font_layout)
 
+        # Optional speed-up, done in the caption pass instead of a separate Extras encode
+        speed_layout = QHBoxLayout()
+        speed_layout.addWidget(QLabel("Speed:"))
+        self.speed_spin = QDoubleSpinBox()
+        self.speed_spin.setRange(1.0, 3.0)
+        self.speed_spin.setSingleStep(0.1)
+        self.speed_spin.setDecimals(1)
+        self.speed_spin.setSuffix("x")
+        speed_layout.addWidget(self.speed_spin)
+        main_layout.addLayout(speed_layout)
+
         # Transcript table (shows word + timings)
         self.table = QTableWidget(0, 3)
         self.table.setHorizontalHeaderLabels(["Word", "Start", "End"])
@@ -353,9 +661,11 @@ class CaptionTab(QWidget):
         # Buttons and progress
         actions = QHBoxLayout()
         self.transcribe_btn = QPushButton("Transcribe")
+        self.transcribe_all_btn = QPushButton("Transcribe All")
         self.caption_btn = QPushButton("Create Captions")
         self.caption_btn.setEnabled(False)
         actions.addWidget(self.transcribe_btn)
+        actions.addWidget(self.transcribe_all_btn)
         actions.addWidget(self.caption_btn)
         main_layout.addLayout(actions)
 
@@ -363,23 +673,39 @@ class CaptionTab(QWidget):
         self.progress.setRange(0, 100)
         self.progress.setValue(0)
         main_layout.addWidget(self.progress)
+        self.jobs_label = QLabel("")
+        main_layout.addWidget(self.jobs_label)
 
         # Connections
         self.transcribe_btn.clicked.connect(self._start_transcription)
+        self.transcribe_all_btn.clicked.connect(self._start_batch_transcription)
         self.caption_btn.clicked.connect(self._start_captioning)
+        self.table.itemChanged.connect(self._on_table_item_changed)
 
         # Populate combos
         self._populate_fonts()
-        self._populate_videos()
+        self.populate_videos()
+
+        # Load the ASR model once the event loop is running so the UI appears first
+        QTimer.singleShot(0, warm_asr_model)
 
     # --------------------------------------------------
     # Populate helpers
     # --------------------------------------------------
-    def _populate_videos(self):
+    def populate_videos(self):
+        # Called on every tab switch; skip the rebuild when no clip was added or removed
+        try:
+            mtime = os.stat(CLIPS_DIR).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime == self._videos_mtime:
+            return
+        self._videos_mtime = mtime
+
         self.video_combo.blockSignals(True)
         self.video_combo.clear()
         if os.path.isdir(CLIPS_DIR):
-            videos = [os.path.join(CLIPS_DIR, f) for f in os.listdir(CLIPS_DIR) if f.lower().endswith((".mp4", ".mkv", ".avi", ".webm"))]
+            videos = _list_files(CLIPS_DIR, VIDEO_EXTENSIONS)
             self.video_combo.addItems([os.path.basename(v) for v in videos])
             self.video_map = {os.path.basename(v): v for v in videos}
         self.video_combo.blockSignals(False)
@@ -399,9 +725,25 @@ class CaptionTab(QWidget):
             QMessageBox.warning(self, "Warning", "Please select a clip.")
             return
         path = self.video_map[name]
+        cached = _cached_words(path)
+        if cached is not None:
+            self._show_words(cached)
+            return
+        self._run_transcription([path])
+
+    def _start_batch_transcription(self):
+        # clips already in the transcript cache are skipped; only the files' existence is checked here
+        paths = [p for p in self.video_map.values() if not _has_cached_words(p)]
+        if not paths:
+            QMessageBox.information(self, "Info", "All clips are already transcribed.")
+            return
+        self._run_transcription(paths)
+
+    def _run_transcription(self, paths: List[str]):
         self.progress.setRange(0, 0)  # indefinite
         self.transcribe_btn.setEnabled(False)
-        self.transcription_worker = TranscriptionThread(path)
+        self.transcribe_all_btn.setEnabled(False)
+        self.transcription_worker = TranscriptionThread(paths)
         self.transcription_worker.finished.connect(self._on_transcription_finished)
         self.transcription_worker.error.connect(self._on_transcription_error)
         self.transcription_worker.start()
@@ -410,26 +752,64 @@ class CaptionTab(QWidget):
         self.progress.setRange(0, 100)
         self.progress.setValue(0)
         self.transcribe_btn.setEnabled(True)
+        self.transcribe_all_btn.setEnabled(True)
         QMessageBox.critical(self, "Error", f"Transcription failed: {msg}")
 
-    def _on_transcription_finished(self, words: List[Dict]):
-        self.words = words
+    def _on_transcription_finished(self, results: Dict[str, List[Dict]]):
         self.progress.setRange(0, 100)
         self.progress.setValue(0)
         self.transcribe_btn.setEnabled(True)
+        self.transcribe_all_btn.setEnabled(True)
+
+        # show the selected clip; the others are in the transcript cache for later
+        path = self.video_map.get(self.video_combo.currentText())
+        words = results.get(path) if path else None
+        if words is None and path:
+            words = _cached_words(path)
+        if words is not None:
+            self._show_words(words)
+
+    def _show_words(self, words: List[Dict]):
+        self.words = words
         self.caption_btn.setEnabled(True)
 
-        # Populate table
-        self.table.setRowCount(len(words))
-        for row, w in enumerate(words):
-            self.table.setItem(row, 0, QTableWidgetItem(w.get("word", "")))
+        # Populate table in one batch: no per-item signals or repaints
+        table = self.table
+        table.setSortingEnabled(False)
+        table.blockSignals(True)
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(len(words))
+            for row, w in enumerate(words):
+                table.setItem(row, 0, QTableWidgetItem(w.get("word", "")))
 
-            # NeMo 1.x uses 'start_time'/'end_time'; newer versions switched to 'start_offset'/'end_offset'.
-            s = w.get("start_time", w.get("start_offset", 0))
-            e = w.get("end_time", w.get("end_offset", 0))
+                # NeMo 1.x uses 'start_time'/'end_time'; newer versions switched to 'start_offset'/'end_offset'.
+                s = w.get("start_time", w.get("start_offset", 0))
+                e = w.get("end_time", w.get("end_offset", 0))
+
+                table.setItem(row, 1, QTableWidgetItem(f"{float(s):.2f}"))
+                table.setItem(row, 2, QTableWidgetItem(f"{float(e):.2f}"))
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
 
-            self.table.setItem(row, 1, QTableWidgetItem(f"{float(s):.2f}"))
-            self.table.setItem(row, 2, QTableWidgetItem(f"{float(e):.2f}"))
+    def _on_table_item_changed(self, item: QTableWidgetItem):
+        """Apply a user's edit of a word or timing straight to self.words."""
+        row, col = item.row(), item.column()
+        if row >= len(self.words):
+            return
+        w = self.words[row]
+        if col == 0:
+            w["word"] = item.text()
+            return
+        key = "start_time" if col == 1 else "end_time"
+        try:
+            w[key] = float(item.text())
+        except ValueError:
+            # not a number: put the previous value back
+            self.table.blockSignals(True)
+            item.setText(f"{float(w.get(key, 0)):.2f}")
+            self.table.blockSignals(False)
 
     # --------------------------------------------------
     # Captioning logic
@@ -441,21 +821,61 @@ class CaptionTab(QWidget):
         name = self.video_combo.currentText()
         video_path = self.video_map[name]
         font_path = self.font_combo.currentData()
+        speed = round(self.speed_spin.value(), 1)
         base, ext = os.path.splitext(name)
+        if speed != 1.0:
+            base = f"{base}_{speed:.1f}x"
         out_name = f"{base}_captioned{ext}"
         out_path = os.path.join(OUTPUT_DIR, out_name)
 
-        self.caption_btn.setEnabled(False)
-        self.progress.setRange(0, 0)
+        # answered from the shared ffprobe cache when another tab already probed the clip
+        try:
+            info = _get_video_info(video_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read video info: {e}")
+            return
 
-        self.caption_worker = CaptioningThread(video_path, self.words, font_path, out_path)
-        self.caption_worker.finished.connect(self._on_captioning_finished)
-        self.caption_worker.start()
+        if any(w.output_path == out_path for w in self.caption_workers):
+            QMessageBox.warning(self, "Warning", f"{out_name} is already being rendered.")
+            return
 
-    def _on_captioning_finished(self, success: bool, message: str):
-        self.progress.setRange(0, 100)
-        self.progress.setValue(0)
-        self.caption_btn.setEnabled(True)
+        # the worker gets its own copy so later table edits don't change a running render
+        worker = CaptioningThread(
+            video_path, [dict(w) for w in self.words], font_path, out_path,
+            info["width"], info["height"], info["has_audio"], info["duration"],
+            speed if speed != 1.0 else None,
+        )
+        worker.progress.connect(self._on_captioning_progress)
+        worker.done.connect(self._on_captioning_done)
+        # the worker is only dropped once its thread has actually stopped
+        worker.finished.connect(lambda w=worker: self._on_captioning_thread_finished(w))
+        self.caption_workers.append(worker)
+        self._update_caption_jobs()
+        worker.start()
+
+    def _update_caption_jobs(self):
+        """Show real progress for a single render with a known duration, otherwise a busy indicator."""
+        jobs = len(self.caption_workers)
+        self.jobs_label.setText(f"{jobs} caption job(s) in progress" if jobs else "")
+        if jobs == 1 and self.caption_workers[0].duration > 0:
+            self.progress.setRange(0, 100)
+            self.progress.setValue(0)
+        elif jobs:
+            self.progress.setRange(0, 0)
+        else:
+            self.progress.setRange(0, 100)
+            self.progress.setValue(0)
+
+    def _on_captioning_progress(self, percent: int):
+        if len(self.caption_workers) == 1:
+            self.progress.setValue(percent)
+
+    def _on_captioning_thread_finished(self, worker: CaptioningThread):
+        self.caption_workers.remove(worker)
+        worker.deleteLater()
+        self._update_caption_jobs()
+
+    def _on_captioning_done(self, success: bool, message: str):
         if success:
             QMessageBox.information(self, "Success", message)
         else:
@@ -19,13 +19,6 @@ OUTPUT_PATH = "videos"
 def create_download_tab() -> QWidget:
     tab = QWidget()
     layout = QVBoxLayout(tab)
-    tab.refresh_targets = []
-
-    def add_refresh_target(target_func):
-        tab.refresh_targets.append(target_func)
-
-    tab.add_refresh_target = add_refresh_target
-
 
     url_label = QLabel("YouTube URL:")
     url_input = QLineEdit()
@@ -69,8 +62,6 @@ def create_download_tab() -> QWidget:
         if success:
             progress_bar.setValue(100)
             QMessageBox.information(tab, "Success", "Download completed successfully!")
-            for target in tab.refresh_targets:
-                target()
         else:
             QMessageBox.critical(tab, "Error", f"Download failed: {message}")
         progress_bar.setValue(0)
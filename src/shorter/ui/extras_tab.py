@@ -5,12 +5,14 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QThread, Signal
 from shorter.core.video_utils import speed_up_video
+from shorter.core.video_dir_cache import invalidate, list_videos
 
 VIDEO_DIR = "videos"
 CUTS_DIR = os.path.join(VIDEO_DIR, "cuts")
 
 class ExtrasWorker(QThread):
-    finished = Signal(bool, str)
+    done = Signal(bool, str)  # success, message; QThread.finished follows once run() has returned
+    progress = Signal(int)
 
     def __init__(self, input_path, output_path, speed):
         super().__init__()
@@ -20,23 +22,20 @@ class ExtrasWorker(QThread):
 
     def run(self):
         try:
-            success = speed_up_video(self.input_path, self.output_path, self.speed)
+            success = speed_up_video(self.input_path, self.output_path, self.speed, self.progress.emit)
             if success:
-                self.finished.emit(True, "Processing finished.")
+                self.done.emit(True, "Processing finished.")
             else:
-                self.finished.emit(False, "Processing failed.")
+                self.done.emit(False, "Processing failed.")
         except Exception as e:
-            self.finished.emit(False, str(e))
+            self.done.emit(False, str(e))
 
 def create_extras_tab() -> QWidget:
     tab = QWidget()
     layout = QVBoxLayout(tab)
     tab.video_map = {}
-    tab.refresh_targets = []
-
-    def add_refresh_target(target_func):
-        tab.refresh_targets.append(target_func)
-    tab.add_refresh_target = add_refresh_target
+    # Speed-up jobs run side by side; each one is independent of the next
+    tab.workers = []
 
     # Video selection
     video_selection_layout = QHBoxLayout()
@@ -88,24 +87,44 @@ def create_extras_tab() -> QWidget:
         out_filename = f"{base}_{speed:.1f}x{ext}"
         out_path = os.path.join(CUTS_DIR, out_filename)
 
-        process_button.setEnabled(False)
-        status_label.setText("Processing...")
-        progress_bar.setRange(0, 0)
+        if any(w.output_path == out_path for w in tab.workers):
+            QMessageBox.warning(tab, "Warning", f"{out_filename} is already being processed.")
+            return
+
+        worker = ExtrasWorker(in_path, out_path, speed)
+        worker.progress.connect(on_progress)
+        worker.done.connect(on_processing_finished)
+        # the worker is only dropped once its thread has actually stopped
+        worker.finished.connect(lambda w=worker: on_thread_finished(w))
+        tab.workers.append(worker)
+        status_label.setText(f"Processing {len(tab.workers)} job(s)...")
+        # a single job reports real progress; several at once share a busy indicator
+        progress_bar.setRange(0, 100 if len(tab.workers) == 1 else 0)
+        progress_bar.setValue(0)
+        worker.start()
 
-        tab.worker = ExtrasWorker(in_path, out_path, speed)
-        tab.worker.finished.connect(on_processing_finished)
-        tab.worker.start()
+    def on_progress(percent):
+        if len(tab.workers) == 1:
+            progress_bar.setValue(percent)
+
+    def on_thread_finished(worker):
+        tab.workers.remove(worker)
+        worker.deleteLater()
+        if not tab.workers:
+            progress_bar.setRange(0, 100)
+            progress_bar.setValue(0)
 
     def on_processing_finished(success, message):
-        process_button.setEnabled(True)
-        status_label.setText(message)
-        progress_bar.setRange(0, 100)
-        progress_bar.setValue(0)
+        # the reporting worker stays in tab.workers until its thread finishes
+        still_running = len(tab.workers) - 1
+        if still_running:
+            status_label.setText(f"{message} {still_running} job(s) still running.")
+        else:
+            status_label.setText(message)
 
         if success:
             QMessageBox.information(tab, "Success", "Video processing complete!")
-            for target in tab.refresh_targets:
-                target()
+            invalidate(CUTS_DIR)
         else:
             QMessageBox.critical(tab, "Error", f"Failed to process video: {message}")
 
@@ -115,14 +134,11 @@ def create_extras_tab() -> QWidget:
         video_combo.blockSignals(True)
         video_combo.clear()
 
-        all_videos = []
         # We'll populate from the 'cuts' directory for this tab
-        if os.path.exists(CUTS_DIR):
-            videos = [os.path.join(CUTS_DIR, f) for f in os.listdir(CUTS_DIR) if f.endswith(('.mp4', '.mkv', '.avi', '.webm'))]
-            all_videos.extend(videos)
+        video_map = list_videos(CUTS_DIR)
 
-        video_combo.addItems([os.path.basename(v) for v in all_videos])
-        tab.video_map = {os.path.basename(v): v for v in all_videos}
+        video_combo.addItems(list(video_map))
+        tab.video_map = video_map
         video_combo.blockSignals(False)
 
     tab.populate_videos = populate_videos
@@ -5,7 +5,7 @@ import os
 # type: ignore[import-untyped]
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QTabWidget, QPushButton, QVBoxLayout
 # type: ignore[import-untyped]
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QFileSystemWatcher
 
 from shorter.ui.download_tab import create_download_tab
 from shorter.ui.select_section_tab import create_select_section_tab
@@ -16,6 +16,9 @@ from shorter.ui.zoom_tab import create_zoom_tab
 from shorter.ui.extras_tab import create_extras_tab
 from shorter.ui.publish_tab import PublishTab
 
+# Folders the tabs list videos from
+WATCHED_DIRS = ["videos", os.path.join("videos", "cuts"), os.path.join("videos", "cuts", "captioned")]
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -27,59 +30,65 @@ class MainWindow(QMainWindow):
         self._create_tabs()
 
     def _create_tabs(self):
-        # Download Tab
-        self.download_tab = create_download_tab()
-        self.select_section_tab = create_select_section_tab()
-        self.remove_silence_tab = create_remove_silence_tab()
-        self.remove_chunks_tab = create_remove_chunks_tab()
-        self.zoom_tab = create_zoom_tab()
-        self.extras_tab = create_extras_tab()
-        self.caption_tab = create_caption_tab()
-        self.publish_tab = PublishTab()
-
-        self.tabs.addTab(self.download_tab, "1. Download")
-        self.tabs.addTab(self.select_section_tab, "2. Select Section")
-        self.tabs.addTab(self.remove_silence_tab, "3. Remove Silence")
-        self.tabs.addTab(self.remove_chunks_tab, "4. Remove Chunks")
-        self.tabs.addTab(self.zoom_tab, "5. Zoom & Pan")
-        self.tabs.addTab(self.caption_tab, "6. Caption")
-        self.tabs.addTab(self.publish_tab, "7. Publish")
-        self.tabs.addTab(self.extras_tab, "Extras")
-
-        # Ensure publish tab shows latest videos
-        if hasattr(self.publish_tab, "refresh"):
-            self.publish_tab.refresh()
-
-        # Pass refresh functions
-        self.download_tab.add_refresh_target(self.select_section_tab.populate_videos)  # type: ignore[attr-defined]
-        self.download_tab.add_refresh_target(self.remove_silence_tab.populate_videos)  # type: ignore[attr-defined]
-        self.download_tab.add_refresh_target(self.remove_chunks_tab.populate_videos)  # type: ignore[attr-defined]
-
-        self.select_section_tab.add_refresh_target(self.remove_silence_tab.populate_videos)  # type: ignore[attr-defined]
-        self.select_section_tab.add_refresh_target(self.remove_chunks_tab.populate_videos)  # type: ignore[attr-defined]
-
-        self.remove_silence_tab.add_refresh_target(self.select_section_tab.populate_videos)  # type: ignore[attr-defined]
-        self.remove_silence_tab.add_refresh_target(self.remove_chunks_tab.populate_videos)  # type: ignore[attr-defined]
+        # Tabs are built the first time they are shown; until then they are empty placeholders
+        self._tab_factories = [
+            ("1. Download", create_download_tab),
+            ("2. Select Section", create_select_section_tab),
+            ("3. Remove Silence", create_remove_silence_tab),
+            ("4. Remove Chunks", create_remove_chunks_tab),
+            ("5. Zoom & Pan", create_zoom_tab),
+            ("6. Caption", create_caption_tab),
+            ("7. Publish", PublishTab),
+            ("Extras", create_extras_tab),
+        ]
+        self._built = {}
+        for title, _ in self._tab_factories:
+            self.tabs.addTab(QWidget(), title)
+        self._build_tab(0)
 
-        self.remove_chunks_tab.add_refresh_target(self.select_section_tab.populate_videos)  # type: ignore[attr-defined]
-        self.remove_chunks_tab.add_refresh_target(self.remove_silence_tab.populate_videos)  # type: ignore[attr-defined]
+        # Tabs only rescan their folders after something in them changed
+        self._stale_tabs = set()
+        for d in WATCHED_DIRS:
+            os.makedirs(d, exist_ok=True)
+        self.fs_watcher = QFileSystemWatcher(WATCHED_DIRS, self)
+        self.fs_watcher.directoryChanged.connect(self._on_directory_changed)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
-        # Setup cross-tab refresh
-        all_tabs = [
-            self.download_tab, self.select_section_tab, self.remove_silence_tab,
-            self.remove_chunks_tab, self.zoom_tab, self.extras_tab,
-            self.caption_tab, self.publish_tab
-        ]
+    def _build_tab(self, index):
+        title, factory = self._tab_factories[index]
+        widget = factory()
+        placeholder = self.tabs.widget(index)
+        # swap the placeholder without emitting currentChanged for the remove/insert
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, widget, title)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        self._built[index] = widget
 
-        for source_tab in all_tabs:
-            for target_tab in all_tabs:
-                if source_tab != target_tab and hasattr(target_tab, 'populate_videos'):
-                    if hasattr(source_tab, 'add_refresh_target'):
-                        source_tab.add_refresh_target(getattr(target_tab, 'populate_videos'))  # type: ignore[attr-defined]
+        # Ensure publish tab shows latest videos
+        if hasattr(widget, "refresh"):
+            widget.refresh()
 
-        def on_tab_changed(index):
-            widget = self.tabs.widget(index)
+    def _on_directory_changed(self, path):
+        # Refresh lazily on the next switch, so the visible tab keeps its selection while a job runs
+        for widget in self._built.values():
             if hasattr(widget, 'populate_videos'):
-                widget.populate_videos()  # type: ignore[attr-defined]
+                self._stale_tabs.add(widget)
+
+    def _on_tab_changed(self, index):
+        # Only the visible tab keeps decoding; players on the other tabs are paused
+        for built_index, widget in self._built.items():
+            player = getattr(widget, 'media_player', None)
+            if built_index != index and player is not None:
+                player.pause()
 
-        self.tabs.currentChanged.connect(on_tab_changed)
\ No newline at end of file
+        if index not in self._built:
+            # a freshly built tab has just listed its folder
+            self._build_tab(index)
+            return
+        widget = self._built[index]
+        if widget in self._stale_tabs:
+            self._stale_tabs.discard(widget)
+            widget.populate_videos()  # type: ignore[attr-defined]
@@ -1,6 +1,8 @@
 import os
 import json
-import glob
+import random
+import socket
+import time
 from typing import Optional, List, Dict
 
 # Suppress linter warnings for PySide6 imports
@@ -12,13 +14,99 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QComboBox,
 from PySide6.QtCore import Qt, QThread, Signal
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+# Captioned clips ready for upload
+CAPTIONED_DIR = os.path.join("videos", "cuts", "captioned")
+# OAuth client secrets, and the token saved after the first sign-in
+CLIENT_SECRETS_FILE = "credentials.json"
+TOKEN_FILE = "token.json"
+SCOPES = ['https://www.googleapis.com/auth/youtube.upload', 'https://www.googleapis.com/auth/youtube']
+# Resumable upload tuning: bytes sent per request, and how often a transient failure is retried
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_UPLOAD_RETRIES = 10
+RETRIABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+# How long the fetched playlist list is reused before it is fetched from YouTube again
+PLAYLIST_CACHE_SECONDS = 300
 
 # Suppress linter warnings for googleapiclient dynamic attributes
 # type: ignore[import]
 # type: ignore[attr-defined]
 
+def _load_cached_credentials() -> Optional[Credentials]:
+    """Return the saved credentials, refreshed if expired, or None if the user must sign in again."""
+    if not os.path.exists(TOKEN_FILE):
+        return None
+    try:
+        credentials = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        if not credentials.valid and credentials.expired and credentials.refresh_token:
+            credentials.refresh(Request())
+        return credentials if credentials.valid else None
+    except Exception as e:
+        print(f"Error loading saved credentials: {e}")
+        return None
+
+
+def _interactive_auth() -> Credentials:
+    """Run the browser sign-in flow and save the resulting token for next time."""
+    flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS_FILE, scopes=SCOPES)
+    credentials = flow.run_local_server(port=0)
+    with open(TOKEN_FILE, "w") as f:
+        f.write(credentials.to_json())
+    return credentials
+
+
+class AuthThread(QThread):
+    """Builds the YouTube service off the GUI thread; the browser sign-in blocks until the user finishes."""
+    finished = Signal(object)  # youtube service
+    error = Signal(str)
+
+    def run(self):
+        try:
+            credentials = _load_cached_credentials() or _interactive_auth()
+            self.finished.emit(build('youtube', 'v3', credentials=credentials))
+        except FileNotFoundError:
+            self.error.emit(f"{CLIENT_SECRETS_FILE} file not found. Please ensure it is in the correct directory.")
+        except Exception as e:
+            self.error.emit(f"Authentication failed: {str(e)}")
+
+
+class PlaylistThread(QThread):
+    """Fetches the signed-in user's playlists off the GUI thread."""
+    loaded = Signal(list)  # playlist resources
+    error = Signal(str)
+
+    def __init__(self, youtube):
+        super().__init__()
+        self.youtube = youtube
+
+    def run(self):
+        try:
+            response = self.youtube.playlists().list(
+                part="snippet",
+                mine=True,
+                maxResults=50
+            ).execute()
+            self.loaded.emit(response.get('items', []))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+def _fill_combo(combo: QComboBox, items: List[tuple]) -> None:
+    """Replace a combo box's (text, data) items in one batch, emitting no per-item signals."""
+    combo.blockSignals(True)
+    try:
+        combo.clear()
+        combo.addItems([text for text, _ in items])
+        for index, (_, data) in enumerate(items):
+            combo.setItemData(index, data)
+    finally:
+        combo.blockSignals(False)
+
+
 class UploadThread(QThread):
     progress = Signal(int)
     status = Signal(str)
@@ -48,7 +136,7 @@ class UploadThread(QThread):
                 }
             }
 
-            media = MediaFileUpload(self.video_file, chunksize=-1, resumable=True)
+            media = MediaFileUpload(self.video_file, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
             request = self.youtube.videos().insert(
                 part="snippet,status",
                 body=body,
@@ -56,11 +144,28 @@ class UploadThread(QThread):
             )
 
             response = None
+            retries = 0
+            last_pct = -1
             while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    self.progress.emit(int(status.progress() * 100))
-                    self.status.emit(f"Uploading: {int(status.progress() * 100)}%")
+                try:
+                    status, response = request.next_chunk()
+                except (HttpError, socket.timeout) as e:
+                    if isinstance(e, HttpError) and e.resp.status not in RETRIABLE_STATUS_CODES:
+                        raise
+                    retries += 1
+                    if retries > MAX_UPLOAD_RETRIES:
+                        raise
+                    # exponential backoff with jitter, as recommended for resumable uploads
+                    delay = random.uniform(0, 2 ** min(retries, 6))
+                    self.status.emit(f"Upload interrupted, retrying in {delay:.1f}s...")
+                    time.sleep(delay)
+                    continue
+                retries = 0
+                pct = int(status.progress() * 100) if status else last_pct
+                if pct != last_pct:
+                    self.progress.emit(pct)
+                    self.status.emit(f"Uploading: {pct}%")
+                    last_pct = pct
 
             video_id = response['id']
             self.status.emit("Video uploaded successfully!")
@@ -93,6 +198,10 @@ class PublishTab(QWidget):
         self.v_layout = QVBoxLayout(self)
         self.youtube = None
         self.playlists: List[Dict] = []
+        self._playlists_cached_at = 0.0
+        self.playlist_thread: Optional[PlaylistThread] = None
+        # mtime of CAPTIONED_DIR at the last scan, so unchanged folders aren't relisted
+        self._videos_mtime: Optional[int] = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -132,6 +241,10 @@ class PublishTab(QWidget):
         self.playlist_combo.addItem("None", None)
         self.v_layout.addWidget(self.playlist_combo)
 
+        self.refresh_playlists_button = QPushButton("Refresh Playlists")
+        self.refresh_playlists_button.clicked.connect(lambda: self.load_playlists(force=True))
+        self.v_layout.addWidget(self.refresh_playlists_button)
+
         self.upload_button = QPushButton("Upload Video")
         self.upload_button.clicked.connect(self.start_upload)
         self.upload_button.setEnabled(False)
@@ -145,57 +258,80 @@ class PublishTab(QWidget):
         self.v_layout.addWidget(self.status_label)
 
     def refresh(self):
+        # local work only; playlists load after sign-in, on demand, or after an upload when stale
         self.load_videos()
-        if self.youtube:
-            self.load_playlists()
 
     def populate_videos(self):
         """Alias used by MainWindow for cross-tab refresh system."""
         self.load_videos()
 
     def load_videos(self):
-        self.video_combo.clear()
-        captioned_folder = os.path.join("videos", "cuts", "captioned")
-        if not os.path.exists(captioned_folder):
-            os.makedirs(captioned_folder, exist_ok=True)
-        videos = glob.glob(os.path.join(captioned_folder, "*.mp4"))
-        for video in videos:
-            self.video_combo.addItem(os.path.basename(video), video)
-
-    def load_playlists(self):
+        os.makedirs(CAPTIONED_DIR, exist_ok=True)
+        mtime = os.stat(CAPTIONED_DIR).st_mtime_ns
+        if mtime == self._videos_mtime:
+            return
+        self._videos_mtime = mtime
+
+        with os.scandir(CAPTIONED_DIR) as entries:
+            videos = [e for e in entries if e.is_file(follow_symlinks=False) and e.name.endswith(".mp4")]
+        _fill_combo(self.video_combo, [(video.name, video.path) for video in videos])
+
+    def load_playlists(self, force: bool = False):
         if not self.youtube:
             return
-        try:
-            self.playlist_combo.clear()
-            self.playlist_combo.addItem("None", None)
-            response = self.youtube.playlists().list(
-                part="snippet",
-                mine=True,
-                maxResults=50
-            ).execute()
-            self.playlists = response.get('items', [])
-            for playlist in self.playlists:
-                self.playlist_combo.addItem(playlist['snippet']['title'], playlist['id'])
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to load playlists: {str(e)}")
+        if self.playlist_thread is not None and self.playlist_thread.isRunning():
+            return
+        if not force and self.playlists and time.monotonic() - self._playlists_cached_at < PLAYLIST_CACHE_SECONDS:
+            return
+        # the service isn't safe to share between threads, so no upload starts while this runs
+        self.refresh_playlists_button.setEnabled(False)
+        self.upload_button.setEnabled(False)
+        self.playlist_thread = PlaylistThread(self.youtube)
+        self.playlist_thread.loaded.connect(self.playlists_loaded)
+        self.playlist_thread.error.connect(self.playlists_failed)
+        self.playlist_thread.start()
+
+    def playlists_loaded(self, playlists: List[Dict]):
+        self.refresh_playlists_button.setEnabled(True)
+        self.upload_button.setEnabled(True)
+        self.playlists = playlists
+        self._playlists_cached_at = time.monotonic()
+        self._rebuild_playlist_combo()
+
+    def playlists_failed(self, message: str):
+        self.refresh_playlists_button.setEnabled(True)
+        self.upload_button.setEnabled(True)
+        QMessageBox.warning(self, "Error", f"Failed to load playlists: {message}")
+
+    def _rebuild_playlist_combo(self):
+        selected = self.playlist_combo.currentData()
+        _fill_combo(
+            self.playlist_combo,
+            [("None", None)] + [(playlist['snippet']['title'], playlist['id']) for playlist in self.playlists],
+        )
+        if selected:
+            self.playlist_combo.setCurrentIndex(max(self.playlist_combo.findData(selected), 0))
 
     def authenticate(self):
-        try:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json',
-                scopes=['https://www.googleapis.com/auth/youtube.upload', 'https://www.googleapis.com/auth/youtube']
-            )
-            credentials = flow.run_local_server(port=0)
-            self.youtube = build('youtube', 'v3', credentials=credentials)
-            self.auth_button.setEnabled(False)
-            self.upload_button.setEnabled(True)
-            self.status_label.setText("Status: Authenticated")
-            self.load_playlists()
-            QMessageBox.information(self, "Success", "Authentication successful!")
-        except FileNotFoundError:
-            QMessageBox.critical(self, "Error", "credentials.json file not found. Please ensure it is in the correct directory.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Authentication failed: {str(e)}")
+        self.auth_button.setEnabled(False)
+        self.status_label.setText("Status: Authenticating...")
+        self.auth_thread = AuthThread()
+        self.auth_thread.finished.connect(self.auth_finished)
+        self.auth_thread.error.connect(self.auth_failed)
+        self.auth_thread.start()
+
+    def auth_finished(self, youtube):
+        # the service is kept and reused for every upload
+        self.youtube = youtube
+        self.upload_button.setEnabled(True)
+        self.status_label.setText("Status: Authenticated")
+        self.load_playlists(force=True)
+        QMessageBox.information(self, "Success", "Authentication successful!")
+
+    def auth_failed(self, message: str):
+        self.auth_button.setEnabled(True)
+        self.status_label.setText("Status: Not authenticated")
+        QMessageBox.critical(self, "Error", message)
 
     def start_upload(self):
         if self.video_combo.currentData() is None:
@@ -209,6 +345,7 @@ class PublishTab(QWidget):
         title = self.title_input.text()
         description = self.description_input.toPlainText()
         privacy = self.privacy_combo.currentText()
+        # uploads with the cached playlist list; a stale one is refetched once the upload is done
         playlist_id = self.playlist_combo.currentData()
 
         self.upload_thread = UploadThread(self.youtube, video_file, title, description, privacy, playlist_id)
@@ -217,9 +354,12 @@ class PublishTab(QWidget):
         self.upload_thread.finished.connect(self.upload_finished)
         self.upload_thread.start()
         self.upload_button.setEnabled(False)
+        self.refresh_playlists_button.setEnabled(False)
 
     def upload_finished(self, success: bool):
         self.upload_button.setEnabled(True)
+        self.refresh_playlists_button.setEnabled(True)
+        self.load_playlists()
         if success:
             QMessageBox.information(self, "Success", "Video uploaded successfully!")
         else:
@@ -14,14 +14,18 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtMultimediaWidgets import QVideoWidget
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import Qt, QUrl, QThread, Signal
+from PySide6.QtCore import Qt, QUrl, QTimer, QThread, Signal
 from superqt import QRangeSlider
 from shorter.core.video_utils import remove_chunks
-import time
+from shorter.core.video_dir_cache import invalidate, list_videos
 
 
 VIDEO_DIR = "videos"
 CUTS_DIR = os.path.join(VIDEO_DIR, "cuts")
+# Interval for applying playback position to the sliders while playing (~30 Hz)
+POSITION_UPDATE_MS = 33
+# Minimum interval between seeks while a range slider handle is dragged
+SEEK_THROTTLE_MS = 60
 
 def format_time(ms: int) -> str:
     s = ms / 1000
@@ -54,12 +58,6 @@ def create_remove_chunks_tab() -> QWidget:
     layout = QVBoxLayout(tab)
     tab.chunks_to_remove = []
     tab.video_map = {}
-    tab.refresh_targets = []
-
-    def add_refresh_target(target_func):
-        tab.refresh_targets.append(target_func)
-
-    tab.add_refresh_target = add_refresh_target
 
     # Video selection
     video_selection_layout = QHBoxLayout()
@@ -116,10 +114,19 @@ def create_remove_chunks_tab() -> QWidget:
     tab.media_player.setAudioOutput(tab.audio_output)
     tab.media_player.setVideoOutput(video_widget)
     tab.previous_range_values = (0, 0)
+    # (path, mtime_ns) of the file currently set on the player
+    tab.loaded_source = None
 
     def load_video(video_name):
         if video_name and video_name in tab.video_map:
             video_path = tab.video_map[video_name]
+            try:
+                source = (video_path, os.stat(video_path).st_mtime_ns)
+            except OSError:
+                return
+            if source == tab.loaded_source:
+                return  # setSource would rebuild the decoder for the same file
+            tab.loaded_source = source
             tab.media_player.setSource(QUrl.fromLocalFile(video_path))
 
     def update_duration(duration):
@@ -130,31 +137,74 @@ def create_remove_chunks_tab() -> QWidget:
     def update_position(position):
         position_slider.setValue(position)
 
+    # Labels show whole seconds, so they are only rewritten when a handle crosses a second
+    tab.label_seconds = (-1, -1)
+
     def update_time_labels(values):
-        start, end = int(values[0]), int(values[1])
-        start_time_label.setText(format_time(start))
-        end_time_label.setText(format_time(end))
+        start, end = int(values[0]) // 1000, int(values[1]) // 1000
+        last_start, last_end = tab.label_seconds
+        if start != last_start:
+            start_time_label.setText(format_time(start * 1000))
+        if end != last_end:
+            end_time_label.setText(format_time(end * 1000))
+        tab.label_seconds = (start, end)
+
+    # Dragging the range slider seeks at most once per SEEK_THROTTLE_MS, to the latest handle position
+    tab.pending_seek = None
+    seek_timer = QTimer(tab)
+    seek_timer.setSingleShot(True)
+    seek_timer.setInterval(SEEK_THROTTLE_MS)
+
+    def apply_pending_seek():
+        if tab.pending_seek is not None:
+            tab.media_player.setPosition(tab.pending_seek)
+            tab.pending_seek = None
+
+    seek_timer.timeout.connect(apply_pending_seek)
 
     def seek_on_drag(values):
         lower, upper = int(values[0]), int(values[1])
         prev_lower, prev_upper = tab.previous_range_values
         if lower != prev_lower:
-            tab.media_player.setPosition(lower)
+            tab.pending_seek = lower
         elif upper != prev_upper:
-            tab.media_player.setPosition(upper)
+            tab.pending_seek = upper
         tab.previous_range_values = (lower, upper)
+        if tab.pending_seek is not None and not seek_timer.isActive():
+            seek_timer.start()
 
     def play_pause():
         if tab.media_player.playbackState() == QMediaPlayer.PlayingState:
             tab.media_player.pause()
-            play_button.setIcon(tab.style().standardIcon(QStyle.SP_MediaPlay))
         else:
             tab.media_player.play()
+
+    # While playing, position updates are applied at most once per POSITION_UPDATE_MS;
+    # seeks while paused still update immediately
+    tab.pending_position = 0
+    position_timer = QTimer(tab)
+    position_timer.setInterval(POSITION_UPDATE_MS)
+    position_timer.timeout.connect(lambda: update_position(tab.pending_position))
+
+    def on_position_changed(position):
+        tab.pending_position = position
+        if not position_timer.isActive():
+            update_position(position)
+
+    def on_playback_state_changed(state):
+        # the icon follows the player, which can also be paused by MainWindow or reach the end
+        if state == QMediaPlayer.PlayingState:
             play_button.setIcon(tab.style().standardIcon(QStyle.SP_MediaPause))
+            position_timer.start()
+        else:
+            play_button.setIcon(tab.style().standardIcon(QStyle.SP_MediaPlay))
+            position_timer.stop()
+            update_position(tab.pending_position)
 
     video_combo.currentTextChanged.connect(load_video)
     tab.media_player.durationChanged.connect(update_duration)
-    tab.media_player.positionChanged.connect(update_position)
+    tab.media_player.positionChanged.connect(on_position_changed)
+    tab.media_player.playbackStateChanged.connect(on_playback_state_changed)
     position_slider.sliderMoved.connect(tab.media_player.setPosition)
     range_slider.valueChanged.connect(update_time_labels)
     range_slider.sliderMoved.connect(seek_on_drag)
@@ -206,8 +256,7 @@ def create_remove_chunks_tab() -> QWidget:
             QMessageBox.information(tab, "Success", "Chunks removed successfully!")
             chunk_list.clear()
             tab.chunks_to_remove.clear()
-            for target in tab.refresh_targets:
-                target()
+            invalidate(CUTS_DIR)
         else:
             QMessageBox.critical(tab, "Error", f"Failed to remove chunks: {message}")
 
@@ -218,13 +267,10 @@ def create_remove_chunks_tab() -> QWidget:
         video_combo.clear()
         chunk_list.clear()
         tab.chunks_to_remove.clear()
-        all_videos = []
-        if os.path.exists(CUTS_DIR):
-            videos = [os.path.join(CUTS_DIR, f) for f in os.listdir(CUTS_DIR) if f.endswith(('.mp4', '.mkv', '.avi', '.webm'))]
-            all_videos.extend(videos)
+        video_map = list_videos(CUTS_DIR)
 
-        video_combo.addItems([os.path.basename(v) for v in all_videos])
-        tab.video_map = {os.path.basename(v): v for v in all_videos}
+        video_combo.addItems(list(video_map))
+        tab.video_map = video_map
         video_combo.blockSignals(False)
         if video_combo.count() > 0:
             load_video(video_combo.currentText())
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import QThread, Signal
 from shorter.core.video_utils import remove_silence
+from shorter.core.video_dir_cache import invalidate, list_videos
 
 VIDEO_DIR = "videos"
 CUTS_DIR = os.path.join(VIDEO_DIR, "cuts")
@@ -18,12 +19,6 @@ CUTS_DIR = os.path.join(VIDEO_DIR, "cuts")
 def create_remove_silence_tab() -> QWidget:
     tab = QWidget()
     layout = QVBoxLayout(tab)
-    tab.refresh_targets = []
-
-    def add_refresh_target(target_func):
-        tab.refresh_targets.append(target_func)
-
-    tab.add_refresh_target = add_refresh_target
 
     # Video selection
     video_selection_layout = QHBoxLayout()
@@ -46,13 +41,10 @@ def create_remove_silence_tab() -> QWidget:
 
     def populate_videos():
         video_combo.clear()
-        all_videos = []
-        if os.path.exists(CUTS_DIR):
-            videos = [os.path.join(CUTS_DIR, f) for f in os.listdir(CUTS_DIR) if f.endswith(('.mp4', '.mkv', '.avi', '.webm'))]
-            all_videos.extend(videos)
+        video_map = list_videos(CUTS_DIR)
 
-        video_combo.addItems([os.path.basename(v) for v in all_videos])
-        tab.video_map = {os.path.basename(v): v for v in all_videos}
+        video_combo.addItems(list(video_map))
+        tab.video_map = video_map
 
     def start_processing():
         selected_video = video_combo.currentText()
@@ -79,8 +71,7 @@ def create_remove_silence_tab() -> QWidget:
         progress_bar.setValue(0)
         if success:
             QMessageBox.information(tab, "Success", "Silence removal complete!")
-            for target in tab.refresh_targets:
-                target()
+            invalidate(CUTS_DIR)
         else:
             QMessageBox.critical(tab, "Error", f"Failed to remove silence: {message}")
 
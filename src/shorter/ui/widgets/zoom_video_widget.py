@@ -1,8 +1,11 @@
-from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsView, QGraphicsScene, QGraphicsRectItem
 from PySide6.QtMultimediaWidgets import QGraphicsVideoItem
 from PySide6.QtGui import QPen, QColor, QPainter
 from PySide6.QtCore import Qt, QRectF, Signal, QPointF
 
+# Drag movement (in scene pixels) below which the selection rectangle isn't redrawn
+DRAG_UPDATE_THRESHOLD = 1.5
+
 class ZoomVideoWidget(QGraphicsView):
     region_selected = Signal(QRectF)
 
@@ -24,12 +27,16 @@ class ZoomVideoWidget(QGraphicsView):
         self.selection_rect_item.setVisible(False)
 
         self.start_pos = QPointF()
+        self.last_end_pos = QPointF()
         self.is_drawing = False
         self.active_rect_item = QGraphicsRectItem()
         self.active_rect_item.setPen(QPen(QColor(255, 0, 0, 200), 2, Qt.PenStyle.SolidLine))
         self.active_rect_item.setBrush(Qt.NoBrush)
+        # the outline only changes when the region does, so keep it rasterised between frames
+        self.active_rect_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.scene.addItem(self.active_rect_item)
         self.active_rect_item.setVisible(False)
+        self.last_active_rect = QRectF()
 
     def video_sink(self):
         return self.video_item.videoSink()
@@ -41,26 +48,45 @@ class ZoomVideoWidget(QGraphicsView):
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.active_rect_item.setVisible(False)
+            # forget the shown rect so the next set_active_rect brings the outline back
+            self.last_active_rect = QRectF()
             self.start_pos = self.mapToScene(event.pos())
+            self.last_end_pos = self.start_pos
             self.is_drawing = True
             self.selection_rect_item.setRect(QRectF(self.start_pos, self.start_pos))
             self.selection_rect_item.setVisible(True)
         super().mousePressEvent(event)
 
+    def _update_selection(self, end_pos):
+        self.last_end_pos = end_pos
+        start = self.start_pos
+        self.selection_rect_item.setRect(
+            min(start.x(), end_pos.x()), min(start.y(), end_pos.y()),
+            abs(end_pos.x() - start.x()), abs(end_pos.y() - start.y()),
+        )
+
     def mouseMoveEvent(self, event):
         if self.is_drawing:
             end_pos = self.mapToScene(event.pos())
-            self.selection_rect_item.setRect(QRectF(self.start_pos, end_pos).normalized())
+            delta = end_pos - self.last_end_pos
+            if abs(delta.x()) + abs(delta.y()) >= DRAG_UPDATE_THRESHOLD:
+                self._update_selection(end_pos)
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self.is_drawing:
             self.is_drawing = False
+            # moves under the threshold were skipped, so finish at the exact release point
+            self._update_selection(self.mapToScene(event.pos()))
             self.region_selected.emit(self.selection_rect_item.rect())
             self.selection_rect_item.setVisible(False)
         super().mouseReleaseEvent(event)
 
     def set_active_rect(self, rect):
+        rect = QRectF(rect)
+        if rect == self.last_active_rect:
+            return
+        self.last_active_rect = rect
         if rect.isNull():
             self.active_rect_item.setVisible(False)
         else:
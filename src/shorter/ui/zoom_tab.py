@@ -1,15 +1,19 @@
+import bisect
 import os
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
     QListWidget, QMessageBox, QStyle, QSlider, QProgressBar
 )
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import Qt, QUrl, QThread, Signal, QRect, QRectF, QSizeF
+from PySide6.QtCore import Qt, QUrl, QTimer, QThread, Signal, QRect, QRectF, QSizeF
 from shorter.ui.widgets.zoom_video_widget import ZoomVideoWidget
 from shorter.core.video_utils import process_zoom_pan, get_video_resolution
+from shorter.core.video_dir_cache import invalidate, list_videos
 
 VIDEO_DIR = "videos"
 CUTS_DIR = os.path.join(VIDEO_DIR, "cuts")
+# Interval for applying playback position to the sliders while playing (~30 Hz)
+POSITION_UPDATE_MS = 33
 
 def format_time(ms: int) -> str:
     s = ms / 1000
@@ -40,15 +44,14 @@ def create_zoom_tab() -> QWidget:
     tab = QWidget()
     layout = QVBoxLayout(tab)
     tab.zoom_regions = []
+    # start times of tab.zoom_regions, kept in step with it for bisecting
+    tab.zoom_times = []
+    tab.last_active_index = -1
     tab.video_map = {}
-    tab.refresh_targets = []
     tab.current_video_resolution = None
     tab.initial_frame_loaded = False
-
-    def add_refresh_target(target_func):
-        tab.refresh_targets.append(target_func)
-
-    tab.add_refresh_target = add_refresh_target
+    # (path, mtime_ns) of the file currently set on the player
+    tab.loaded_source = None
 
     # Video selection
     video_selection_layout = QHBoxLayout()
@@ -99,6 +102,13 @@ def create_zoom_tab() -> QWidget:
     def load_video(video_name):
         if video_name and video_name in tab.video_map:
             video_path = tab.video_map[video_name]
+            try:
+                source = (video_path, os.stat(video_path).st_mtime_ns)
+            except OSError:
+                return
+            if source == tab.loaded_source:
+                return  # setSource would rebuild the decoder for the same file
+            tab.loaded_source = source
             tab.initial_frame_loaded = False  # Reset flag for new video
             tab.media_player.setSource(QUrl.fromLocalFile(video_path))
             tab.current_video_resolution = get_video_resolution(video_path)
@@ -115,39 +125,53 @@ def create_zoom_tab() -> QWidget:
     def update_position(position):
         position_slider.setValue(position)
 
-        current_time_sec = position / 1000.0
-        active_rect = QRectF()
-
-        # Find the last region with a start time before the current playback time
-        found_region = None
-        for region in tab.zoom_regions:
-            if region['time'] <= current_time_sec:
-                found_region = region
-            else:
-                break # List is sorted, so we can stop
-
-        if found_region:
-            active_rect = found_region['rect']
-        else:
-            active_rect = QRectF()
-
-        video_widget.set_active_rect(active_rect)
+        # The last region starting at or before the current playback time
+        index = bisect.bisect_right(tab.zoom_times, position / 1000.0) - 1
+        if index == tab.last_active_index:
+            return  # avoid redrawing the scene for an unchanged region
+        tab.last_active_index = index
+        video_widget.set_active_rect(tab.zoom_regions[index]['rect'] if index >= 0 else QRectF())
 
     def play_pause():
         if tab.media_player.playbackState() == QMediaPlayer.PlayingState:
             tab.media_player.pause()
-            play_button.setIcon(tab.style().standardIcon(QStyle.SP_MediaPlay))
         else:
             tab.media_player.play()
+
+    # While playing, position updates are applied at most once per POSITION_UPDATE_MS;
+    # seeks while paused still update immediately
+    tab.pending_position = 0
+    position_timer = QTimer(tab)
+    position_timer.setInterval(POSITION_UPDATE_MS)
+    position_timer.timeout.connect(lambda: update_position(tab.pending_position))
+
+    def on_position_changed(position):
+        tab.pending_position = position
+        if not position_timer.isActive():
+            update_position(position)
+
+    def on_playback_state_changed(state):
+        # the icon follows the player, which can also be paused by MainWindow or reach the end
+        if state == QMediaPlayer.PlayingState:
             play_button.setIcon(tab.style().standardIcon(QStyle.SP_MediaPause))
+            position_timer.start()
+        else:
+            play_button.setIcon(tab.style().standardIcon(QStyle.SP_MediaPlay))
+            position_timer.stop()
+            update_position(tab.pending_position)
 
     video_combo.currentTextChanged.connect(load_video)
     tab.media_player.durationChanged.connect(update_duration)
-    tab.media_player.positionChanged.connect(update_position)
+    tab.media_player.positionChanged.connect(on_position_changed)
+    tab.media_player.playbackStateChanged.connect(on_playback_state_changed)
     position_slider.sliderMoved.connect(tab.media_player.setPosition)
     play_button.clicked.connect(play_pause)
 
     # Zoom Logic
+    def reset_zoom_times():
+        tab.zoom_times = [region['time'] for region in tab.zoom_regions]
+        tab.last_active_index = None  # force the next position update to redraw
+
     def add_zoom_region(rect_f: QRectF):
         if not tab.current_video_resolution:
             QMessageBox.warning(tab, "Error", "Could not determine video resolution.")
@@ -159,18 +183,16 @@ def create_zoom_tab() -> QWidget:
         timestamp = tab.media_player.position()
         region_text = f"{format_time(timestamp)} -> Rect({scaled_rect.x()}, {scaled_rect.y()}, {scaled_rect.width()}, {scaled_rect.height()})"
 
-        tab.zoom_regions.append({
-            'time': timestamp / 1000.0,
+        # Insert in time order, after any region with the same start time
+        region_time = timestamp / 1000.0
+        index = bisect.bisect_right(tab.zoom_times, region_time)
+        tab.zoom_times.insert(index, region_time)
+        tab.zoom_regions.insert(index, {
+            'time': region_time,
             'rect': scaled_rect,
         })
-        # Sort regions by time after adding
-        tab.zoom_regions.sort(key=lambda x: x['time'])
-        # Regenerate list to reflect sorted order
-        region_list.clear()
-        for region in tab.zoom_regions:
-            scaled_rect = region['rect']
-            region_text = f"{format_time(region['time'] * 1000)} -> Rect({scaled_rect.x()}, {scaled_rect.y()}, {scaled_rect.width()}, {scaled_rect.height()})"
-            region_list.addItem(region_text)
+        region_list.insertItem(index, region_text)
+        tab.last_active_index = None  # force the next position update to redraw
 
     def remove_selected_region():
         selected_items = region_list.selectedItems()
@@ -181,6 +203,7 @@ def create_zoom_tab() -> QWidget:
         row = region_list.row(selected_items[0])
         region_list.takeItem(row)
         tab.zoom_regions.pop(row)
+        reset_zoom_times()
 
     video_widget.region_selected.connect(add_zoom_region)
     remove_region_button.clicked.connect(remove_selected_region)
@@ -211,8 +234,7 @@ def create_zoom_tab() -> QWidget:
 
         if success:
             QMessageBox.information(tab, "Success", "Zoom processing complete!")
-            for target in tab.refresh_targets:
-                target()
+            invalidate(CUTS_DIR)
         else:
             QMessageBox.critical(tab, "Error", f"Failed to process zoom: {message}")
 
@@ -224,14 +246,13 @@ def create_zoom_tab() -> QWidget:
         video_combo.clear()
         region_list.clear()
         tab.zoom_regions.clear()
+        tab.zoom_times = []
+        tab.last_active_index = -1
         video_widget.set_active_rect(QRectF())
-        all_videos = []
-        if os.path.exists(CUTS_DIR):
-            videos = [os.path.join(CUTS_DIR, f) for f in os.listdir(CUTS_DIR) if f.endswith(('.mp4', '.mkv', '.avi', '.webm'))]
-            all_videos.extend(videos)
+        video_map = list_videos(CUTS_DIR)
 
-        video_combo.addItems([os.path.basename(v) for v in all_videos])
-        tab.video_map = {os.path.basename(v): v for v in all_videos}
+        video_combo.addItems(list(video_map))
+        tab.video_map = video_map
         video_combo.blockSignals(False)
         if video_combo.count() > 0:
             load_video(video_combo.currentText())
@@ -1,138 +1,115 @@
 
+import bisect
 import csv
+import functools
 import os
-import random
+import subprocess
 from typing import List, TypedDict
 
-from numpy.lib import math
+import numpy as np
+from PIL import ImageFont
 import torch
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 from moviepy import (
     Clip,
     CompositeVideoClip,
     TextClip,
     VideoFileClip,
-    vfx,
 )
 
-AVOID_LIST = {
-    "a",
-    "about",
-    "all",
-    "an",
-    "and",
-    "are",
-    "as",
-    "at",
-    "be",
-    "been",
-    "but",
-    "by",
-    "can",
-    "could",
-    "came",
-    "come",
-    "did",
-    "do",
-    "does",
-    "for",
-    "from",
-    "had",
-    "has",
-    "have",
-    "he",
-    "her",
-    "here",
-    "him",
-    "his",
-    "how",
-    "if",
-    "in",
-    "into",
-    "is",
-    "it",
-    "its",
-    "like",
-    "me",
-    "more",
-    "my",
-    "no",
-    "not",
-    "of",
-    "on",
-    "one",
-    "or",
-    "our",
-    "out",
-    "she",
-    "should",
-    "so",
-    "some",
-    "than",
-    "that",
-    "the",
-    "their",
-    "them",
-    "then",
-    "there",
-    "these",
-    "they",
-    "this",
-    "those",
-    "to",
-    "too",
-    "up",
-    "us",
-    "was",
-    "we",
-    "were",
-    "what",
-    "when",
-    "where",
-    "which",
-    "who",
-    "will",
-    "with",
-    "would",
-    "you",
-    "your",
-    "am",
-    "an",
-    "are",
-    "at",
-    "be",
-    "by",
-    "did",
-    "do",
-    "go",
-    "had",
-    "has",
-    "have",
-    "he",
-    "her",
-    "him",
-    "his",
-    "i",
-    "if",
-    "in",
-    "is",
-    "it",
-    "me",
-    "my",
-    "no",
-    "not",
-    "of",
-    "on",
-    "or",
-    "so",
-    "that",
-    "this",
-    "to",
-    "up",
-    "us",
-    "we",
-    "you",
-}
+from shorter.core.video_utils import detect_hwaccel
+
+AVOID_LIST = frozenset(
+    {
+        "a",
+        "about",
+        "all",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "been",
+        "but",
+        "by",
+        "can",
+        "could",
+        "came",
+        "come",
+        "did",
+        "do",
+        "does",
+        "for",
+        "from",
+        "had",
+        "has",
+        "have",
+        "he",
+        "her",
+        "here",
+        "him",
+        "his",
+        "how",
+        "if",
+        "in",
+        "into",
+        "is",
+        "it",
+        "its",
+        "like",
+        "me",
+        "more",
+        "my",
+        "no",
+        "not",
+        "of",
+        "on",
+        "one",
+        "or",
+        "our",
+        "out",
+        "she",
+        "should",
+        "so",
+        "some",
+        "than",
+        "that",
+        "the",
+        "their",
+        "them",
+        "then",
+        "there",
+        "these",
+        "they",
+        "this",
+        "those",
+        "to",
+        "too",
+        "up",
+        "us",
+        "was",
+        "we",
+        "were",
+        "what",
+        "when",
+        "where",
+        "which",
+        "who",
+        "will",
+        "with",
+        "would",
+        "you",
+        "your",
+        "am",
+        "go",
+        "i",
+    }
+)
+
+
+# faster-whisper expects mono 16 kHz float32 audio
+SAMPLE_RATE = 16000
 
 
 class WordTranscript(TypedDict):
@@ -142,57 +119,112 @@ class WordTranscript(TypedDict):
     word: str
 
 
-# This is because whisper's start time is not reliable and is sometimes way too early
-def _word_timing_adjusted(word: WordTranscript):
-    start = float(word["start"])
-    end = float(word["end"])
-    duration = end - start
-    max_duration = math.log(len(word["word"]), 8)
+class _TimeIndexedComposite(CompositeVideoClip):
+    # CompositeVideoClip tests every overlay on every frame to find the ones playing.
+    # Word clips are short, so only those starting within the longest clip's
+    # duration before t can be visible; find them by bisecting the start times.
+    def __init__(self, clips, **kwargs):
+        super().__init__(clips, **kwargs)
+        self._by_start = sorted(range(len(self.clips)), key=lambda i: self.clips[i].start)
+        self._starts = [self.clips[i].start for i in self._by_start]
+        durations = [clip.duration for clip in self.clips]
+        self._longest = None if None in durations else max(durations, default=0)
+
+    def playing_clips(self, t=0):
+        if self._longest is None or isinstance(t, np.ndarray):
+            return super().playing_clips(t)
+        lo = bisect.bisect_left(self._starts, t - self._longest)
+        hi = bisect.bisect_right(self._starts, t)
+        # keep list order, which is the stacking order
+        playing = sorted(i for i in self._by_start[lo:hi] if self.clips[i].is_playing(t))
+        return [self.clips[i] for i in playing]
 
-    if duration > max_duration:
-        start = end - max_duration
 
-    return start, end
+def _with_fades(clip: Clip.Clip, fade_in: float, fade_out: float):
+    # Same opacity as CrossFadeIn + CrossFadeOut, but as one mask transform that
+    # leaves frames outside the two ramps untouched
+    duration = clip.duration
 
+    def ramp(get_frame, t):
+        opacity = min(1.0, t / fade_in) * min(1.0, (duration - t) / fade_out)
+        frame = get_frame(t)
+        return frame if opacity >= 1.0 else frame * opacity
 
-def transcribe_file(file: str):
-    video = VideoFileClip(file)
-    video.audio.write_audiofile("temp/temp.wav")  # pyright: ignore
+    if clip.mask is None:
+        clip = clip.with_mask()
+    return clip.with_mask(clip.mask.transform(ramp))
+
+
+# This is because whisper's start time is not reliable and is sometimes way too early
+def _word_timings_adjusted(transcription: List[WordTranscript]):
+    count = len(transcription)
+    starts = np.fromiter((w["start"] for w in transcription), dtype=np.float64, count=count)
+    ends = np.fromiter((w["end"] for w in transcription), dtype=np.float64, count=count)
+    lengths = np.fromiter((len(w["word"]) for w in transcription), dtype=np.float64, count=count)
+    max_durations = np.log(np.maximum(lengths, 1)) / np.log(8)
+
+    starts = np.where(ends - starts > max_durations, ends - max_durations, starts)
+    return starts, ends
+
+
+def _decode_audio(file: str) -> np.ndarray:
+    # Pipe raw PCM from ffmpeg instead of writing and re-reading a temp wav
+    command = [
+        "ffmpeg", "-v", "error", "-i", file, "-vn",
+        "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+    ]
+    pcm = subprocess.run(command, check=True, capture_output=True).stdout
+    return np.frombuffer(pcm, dtype=np.float32)
+
+
+def transcribe_file(
+    file: str,
+    beam_size: int = 5,
+    patience: float = 1.0,
+    batch_size: int = 16,
+    log_progress: bool = False,
+):
+    audio = _decode_audio(file)
 
     device = "cuda" if torch.cuda.is_available() else "cpu"
 
-    model = WhisperModel("large-v3", device, compute_type="float32")
-    segments, _ = model.transcribe(
-        "temp/temp.wav",
+    # int8 weights with fp16 activations on GPU, plain int8 on CPU: roughly half the
+    # memory of float32 and faster on both, for a negligible accuracy cost
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    # One transcription at a time, so extra workers only add idle threads; on CPU
+    # use every core instead of CTranslate2's default of 4
+    model = WhisperModel(
+        "large-v3",
+        device,
+        compute_type=compute_type,
+        cpu_threads=(os.cpu_count() or 4) if device == "cpu" else 4,
+        num_workers=1,
+    )
+    # VAD splits the audio into ~30s chunks that are encoded batch_size at a time
+    pipeline = BatchedInferencePipeline(model)
+    segments, _ = pipeline.transcribe(
+        audio,
         suppress_tokens=[],
         language="en",
-        # vad_filter=True,
+        vad_filter=True,
         condition_on_previous_text=False,
-        log_progress=True,
-        beam_size=15,
-        patience=1.5,
+        log_progress=log_progress,
+        beam_size=beam_size,
+        patience=patience,
         word_timestamps=True,
+        batch_size=batch_size,
     )
 
-    transcription: List[WordTranscript] = []
-    for segment in segments:
-        for word in segment.words or []:
-            transcription.append(
-                {
-                    "start": word.start,
-                    "end": word.end,
-                    "probability": word.probability,
-                    "word": word.word,
-                }
-            )
-
+    # Words are written as the lazy segment generator decodes them, without a list in between
     filename = os.path.basename(file)
-    with open(f"output/{filename}.csv", "w") as output:
-        writer = csv.DictWriter(
-            output, fieldnames=["start", "end", "probability", "word"]
+    with open(f"output/{filename}.csv", "w", newline="", buffering=1 << 20) as output:
+        writer = csv.writer(output)
+        writer.writerow(["start", "end", "probability", "word"])
+        writer.writerows(
+            (word.start, word.end, word.probability, word.word)
+            for segment in segments
+            for word in segment.words or []
         )
-        writer.writeheader()
-        writer.writerows(transcription)
 
 
 def caption_video(
@@ -207,42 +239,60 @@ def caption_video(
 ):
     # ##### private functions #######
 
-    def _create_font_autoresize(size: int, word: str, max_width: int = 9999999):
-        clip = None
-        for i in range(10, -1, -1):
-            modifier = i / 10
-            clip = TextClip(
-                font,
-                text=word,
-                method="label",
-                stroke_color="black",
-                vertical_align="center",
-                stroke_width=5,
-                size=(None, size),
-                margin=(13, 2, 13, 12),
-                font_size=size * modifier,
-                color="white",
-            )
+    @functools.lru_cache(maxsize=64)
+    def _pil_font(size: float):
+        return ImageFont.truetype(font, size)
 
-            if clip.size[0] < max_width:
+    # Rendering a TextClip is the slow part, and transcripts repeat words a lot.
+    # with_position/with_start return copies, so cached clips are never mutated.
+    @functools.lru_cache(maxsize=4096)
+    def _create_font_autoresize(size: int, word: str, max_width: int = 9999999):
+        # Measure with PIL to pick the scale, then render the TextClip only once.
+        # Width is the text plus the stroke on both sides and the 13px side margins.
+        modifier = 0.1
+        for i in range(10, 0, -1):
+            width = _pil_font(size * i / 10).getlength(word) + 2 * 5 + 26
+            if width < max_width:
+                modifier = i / 10
                 break
 
-        assert clip is not None
+        clip = TextClip(
+            font,
+            text=word,
+            method="label",
+            stroke_color="black",
+            vertical_align="center",
+            stroke_width=5,
+            size=(None, size),
+            margin=(13, 2, 13, 12),
+            font_size=size * modifier,
+            color="white",
+        )
         return clip
 
     ################################
 
-    with open(csv_file, mode="r") as csvfile:
-        reader = csv.DictReader(csvfile)
-        transcription: List[WordTranscript] = list(reader)  # pyright: ignore
-
     video = VideoFileClip(vid_file)
     if test:
         print("test captioning enabled!")
         video = video.subclipped(0.0, 20.0)
-        transcription = [x for x in transcription if float(x["end"]) < 20.0]
-    else:
-        video = video
+
+    # Parse each row's numbers once while streaming the file, dropping rows past the test cut
+    max_end = 20.0 if test else float("inf")
+    with open(csv_file, mode="r", newline="") as csvfile:
+        transcription: List[WordTranscript] = [
+            word
+            for word in (
+                WordTranscript(
+                    start=float(row["start"]),
+                    end=float(row["end"]),
+                    probability=float(row["probability"]),
+                    word=row["word"],
+                )
+                for row in csv.DictReader(csvfile)
+            )
+            if word["end"] < max_end
+        ]
 
     text_clips: List[Clip.Clip] = []
 
@@ -255,11 +305,12 @@ def caption_video(
         template_width = video.size[0] - xpos
         current_line_clips: List[TextClip] = []
         x = xpos
-        for n_word in transcription:
-            clip = _create_font_autoresize(font_size, n_word["word"])
-            clip = TextClip(
+
+        @functools.lru_cache(maxsize=4096)
+        def _create_line_word(word: str):
+            return TextClip(
                 font,
-                text=n_word["word"],
+                text=word,
                 method="label",
                 stroke_color="black",
                 stroke_width=5,
@@ -269,19 +320,20 @@ def caption_video(
                 color="white",
             )
 
-            start, _ = _word_timing_adjusted(n_word)
+        starts, _ = _word_timings_adjusted(transcription)
+        for word_index, n_word in enumerate(transcription):
+            clip = _create_line_word(n_word["word"])
+
+            start = float(starts[word_index])
 
             if x + clip.size[0] > template_width:
                 x = xpos
                 for textclip in current_line_clips:
                     text_clips.append(
-                        textclip.with_duration(
-                            start - textclip.start + 0.5
-                        ).with_effects(
-                            [
-                                vfx.CrossFadeIn(0.5),
-                                vfx.CrossFadeOut(0.3),
-                            ]
+                        _with_fades(
+                            textclip.with_duration(start - textclip.start + 0.5),
+                            0.5,
+                            0.3,
                         )
                     )
 
@@ -294,19 +346,15 @@ def caption_video(
             x = x + clip.size[0]
 
     if caption_type == 2:
-        words_to_delete = []
-        for i, word in enumerate(transcription):
-            if i == 0:
-                continue
-
-            p_word = transcription[i - 1]
-            if word["word"].startswith("-"):
-                p_word["word"] = p_word["word"] + word["word"]
-                p_word["end"] = word["end"]
-                words_to_delete.append(word)
-
-        for word in words_to_delete:
-            transcription.remove(word)
+        # Fold hyphenated continuations ("-like") into the word before them
+        merged: List[WordTranscript] = []
+        for word in transcription:
+            if merged and word["word"].startswith("-"):
+                merged[-1]["word"] = merged[-1]["word"] + word["word"]
+                merged[-1]["end"] = word["end"]
+            else:
+                merged.append(word)
+        transcription = merged
 
         if caption_size is not None:
             width, height = caption_size
@@ -322,13 +370,24 @@ def caption_video(
         x = 0
         current_line: List[TextClip] = []
 
-        def _new_font_size(word: str):
-            rand = random.random()
-            if word.lower().replace(".", "").replace(",", "") in AVOID_LIST:
-                # print(f"avoided {text} since it is common")
-                return fonts[0] if rand < 0.6 else fonts[1]
-            else:
-                return fonts[0] if rand < 0.4 else fonts[1] if rand < 0.65 else fonts[2]
+        # Common words get the smaller sizes; cleaned once per word rather than on every pick
+        is_avoided = np.array(
+            [
+                w["word"].strip().lower().replace(".", "").replace(",", "") in AVOID_LIST
+                for w in transcription
+            ],
+            dtype=bool,
+        )
+        # One random draw per word decides the size a line starting at that word gets
+        rands = np.random.random(len(transcription))
+        font_choices = np.where(
+            is_avoided,
+            np.where(rands < 0.6, fonts[0], fonts[1]),
+            np.where(rands < 0.4, fonts[0], np.where(rands < 0.65, fonts[1], fonts[2])),
+        )
+
+        def _new_font_size(word_index: int):
+            return int(font_choices[word_index])
 
         if caption_position is None or caption_position == "":
             xpos, ypos = 220, 60
@@ -340,22 +399,19 @@ def caption_video(
         def _place_current_line(line: List[TextClip], end_time: float, lag: float = 0):
             for line_clip in line:
                 text_clips.append(
-                    line_clip.with_duration(
-                        end_time - line_clip.start + 0.5 + lag
-                    ).with_effects(
-                        [
-                            vfx.CrossFadeIn(0.3),
-                            vfx.CrossFadeOut(0.3),
-                        ]
+                    _with_fades(
+                        line_clip.with_duration(end_time - line_clip.start + 0.5 + lag),
+                        0.3,
+                        0.3,
                     )
                 )
 
+        starts, ends = _word_timings_adjusted(transcription)
         for word_index, n_word in enumerate(transcription):
-            p_word = transcription[word_index - 1] if word_index > 0 else None
             text = n_word["word"].strip()
 
-            start, _ = _word_timing_adjusted(n_word)
-            _, p_end = _word_timing_adjusted(p_word) if p_word is not None else (0, 0)
+            start = float(starts[word_index])
+            p_end = float(ends[word_index - 1]) if word_index > 0 else 0
             clip = _create_font_autoresize(new_font_size, text, width)
 
             reset = False
@@ -364,7 +420,7 @@ def caption_video(
                 if x + clip.size[0] > width:
                     y = y + clip.size[1] + 5
                     x = 0
-                    new_font_size = _new_font_size(text)
+                    new_font_size = _new_font_size(word_index)
                     clip = _create_font_autoresize(new_font_size, text, width)
 
                 if y + clip.size[1] > height:
@@ -378,7 +434,7 @@ def caption_video(
                     _place_current_line(current_line, p_end, lag)
                     current_line = []
                     x, y = 0, 0
-                    new_font_size = _new_font_size(text)
+                    new_font_size = _new_font_size(word_index)
                     clip = _create_font_autoresize(new_font_size, text, width)
 
             clip = clip.with_position((x + xpos, y + ypos)).with_start(start)
@@ -394,5 +450,29 @@ def caption_video(
     else:
         raise Exception("Not supported caption type")
 
-    video_with_text = CompositeVideoClip([video] + text_clips)
-    video_with_text.write_videofile("output/output_sentence.mp4")
\ No newline at end of file
+    # The opaque video is the background, so no transparent canvas or mask composite
+    # is built per frame; duration and audio come from the video, not the overlays
+    video_with_text = (
+        _TimeIndexedComposite([video] + text_clips, use_bgclip=True)
+        .with_duration(video.duration)
+        .with_audio(video.audio)
+    )
+    # Encode on the GPU's video block when one works, otherwise x264 on every core.
+    # The probe runs the app's ffmpeg, not moviepy's bundled one, so an encoder it
+    # found can still be missing here; retry in software if the hardware write fails
+    hwaccel = detect_hwaccel()
+    if hwaccel is not None:
+        _, encoder, encoder_options = hwaccel
+        try:
+            video_with_text.write_videofile(
+                "output/output_sentence.mp4",
+                codec=encoder,
+                ffmpeg_params=encoder_options,
+                threads=os.cpu_count(),
+            )
+            return
+        except OSError as e:
+            print(f"{encoder} encode failed, falling back to libx264: {e}")
+    video_with_text.write_videofile(
+        "output/output_sentence.mp4", codec="libx264", threads=os.cpu_count()
+    )
\ No newline at end of file
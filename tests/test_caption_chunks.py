@@ -0,0 +1,59 @@
+from shorter.ui.caption_tab import (
+    ASR_SAMPLE_RATE,
+    TRANSCRIBE_CHUNK_SECONDS,
+    _chunk_windows,
+    _merge_windows,
+)
+
+
+def _word(text, start, end):
+    return {"word": text, "start_time": start, "end_time": end}
+
+
+def test_chunks_overlap_and_cover_the_clip():
+    n = 70 * ASR_SAMPLE_RATE
+    windows = _chunk_windows(n)
+    starts = [start for start, _ in windows]
+    chunk_len = TRANSCRIBE_CHUNK_SECONDS * ASR_SAMPLE_RATE
+    assert starts[0] == 0
+    assert starts[-1] + chunk_len >= n
+    # every chunk begins before the previous one ends
+    assert all(nxt < start + chunk_len for start, nxt in zip(starts, starts[1:]))
+    assert windows[-1][1] == float("inf")
+
+
+def test_short_and_empty_clips():
+    assert _chunk_windows(0) == []
+    assert _chunk_windows(5 * ASR_SAMPLE_RATE) == [(0, float("inf"))]
+
+
+def test_word_on_a_chunk_edge_is_kept_once_and_whole():
+    (first_start, first_cut), (second_start, second_cut) = _chunk_windows(50 * ASR_SAMPLE_RATE)
+    edge = (first_start + TRANSCRIBE_CHUNK_SECONDS * ASR_SAMPLE_RATE) / ASR_SAMPLE_RATE
+    assert second_start / ASR_SAMPLE_RATE < first_cut < edge
+
+    # the first chunk hears "boundary" cut off at its edge; the second hears it whole
+    first = [
+        _word("before", 20.0, 20.5),
+        _word("overlap", first_cut - 0.6, first_cut - 0.1),
+        _word("boundary", edge - 0.4, edge),
+    ]
+    second = [
+        _word("overlap", first_cut - 0.62, first_cut - 0.08),
+        _word("boundary", edge - 0.4, edge + 0.5),
+        _word("after", edge + 1.0, edge + 1.4),
+    ]
+    merged = _merge_windows([(first, first_cut), (second, second_cut)])
+
+    assert [w["word"] for w in merged] == ["before", "overlap", "boundary", "after"]
+    boundary = merged[2]
+    assert (boundary["start_time"], boundary["end_time"]) == (edge - 0.4, edge + 0.5)
+
+
+def test_word_across_the_hand_over_point_is_not_duplicated():
+    (_, cut), (_, last) = _chunk_windows(50 * ASR_SAMPLE_RATE)
+    # the two chunks time the same word slightly differently, on either side of the cut
+    first = [_word("across", cut - 0.3, cut + 0.28)]
+    second = [_word("across", cut - 0.26, cut + 0.3)]
+    merged = _merge_windows([(first, cut), (second, last)])
+    assert [w["word"] for w in merged] == ["across"]